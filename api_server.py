@@ -6,13 +6,19 @@ the existing STOCK SIMULATOR portfolio and market data functionality.
 """
 
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+import hashlib
 import sys
+import threading
+import time
 import os
 from pathlib import Path
-import pandas as pd
-import pytz
+import numpy as np
+import yfinance as yf
 
 # Add src to path - handle both direct execution and module import
 current_dir = Path(__file__).parent
@@ -21,7 +27,12 @@ if current_dir not in sys.path:
 
 # Now import from src
 try:
-    from src.data_fetcher import fetch_latest_quote, QuoteFetchError
+    from src.data_fetcher import (
+        QuoteFetchError,
+        fetch_latest_prices,
+        fetch_prices_concurrently,
+    )
+    from src.quote_cache import cached_fetch_latest_quote
     from src.transaction_manager import (
         TransactionManager,
         TransactionError,
@@ -32,18 +43,94 @@ try:
     from src.snapshot_store import SnapshotStore
     from src.cli import load_portfolio, save_portfolio
     from src.logger import init_logging, get_logger
-    from src.config import DATA_DIR
+    from src.config import DATA_DIR, ensure_data_dir
+    from src import json_utils
 except ImportError as e:
     print(f"Error importing from src: {e}")
     print(f"Current directory: {os.getcwd()}")
     print(f"Python path: {sys.path}")
     raise
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by src.json_utils (orjson when installed).
+
+    Every jsonify() call goes through response(), so endpoints keep using
+    jsonify while encoding runs through orjson (incl. NumPy arrays).
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return json_utils.dumps(obj, default=self.default).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return json_utils.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = json_utils.dumps(obj, default=self.default)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for local development
 
 log = get_logger(__name__)
 
+# Shared worker pool for upstream quote fetches: bounds concurrent yfinance
+# calls across all requests and avoids spawning threads per request.
+QUOTE_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="quote")
+
+# Serializes a trade's load -> execute -> save inside this process so two
+# concurrent trades can't both start from the same file and drop one write.
+# The save stays synchronous: the file is the only state shared with other
+# processes (CLI, sim, additional gunicorn workers).
+_trade_lock = threading.Lock()
+
+
+# Chart polls repeat the same (ticker, period, interval) every few seconds.
+# Keep fetched history per key for roughly one bar so repeat polls skip the
+# network; the TTL follows the bar interval.
+HIST_TTL_SECONDS = {"1m": 30, "5m": 60, "15m": 120, "1h": 600, "1d": 3600}
+DEFAULT_HIST_TTL_SECONDS = 60
+_hist_cache = {}  # (ticker, period, interval) -> (fetched_at, DataFrame)
+_hist_lock = threading.Lock()
+
+
+@lru_cache(maxsize=256)
+def _get_ticker(symbol):
+    """Return a shared yf.Ticker per symbol (reuses its session/metadata)."""
+    return yf.Ticker(symbol)
+
+
+def _fetch_history(symbol, period, interval):
+    """Return yfinance history for symbol, served from the TTL cache when fresh."""
+    key = (symbol, period, interval)
+    ttl = HIST_TTL_SECONDS.get(interval, DEFAULT_HIST_TTL_SECONDS)
+    now = time.monotonic()
+
+    with _hist_lock:
+        cached = _hist_cache.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+
+    hist = _get_ticker(symbol).history(period=period, interval=interval)
+
+    if not hist.empty:
+        with _hist_lock:
+            # Drop expired entries so the cache stays bounded by active charts.
+            for stale_key, (fetched_at, _) in list(_hist_cache.items()):
+                stale_ttl = HIST_TTL_SECONDS.get(stale_key[2], DEFAULT_HIST_TTL_SECONDS)
+                if now - fetched_at >= stale_ttl:
+                    del _hist_cache[stale_key]
+            _hist_cache[key] = (now, hist)
+    return hist
+
 
 @app.route("/api/quote/<ticker>", methods=["GET"])
 def get_quote(ticker):
@@ -63,7 +150,7 @@ def get_quote(ticker):
         }
     """
     try:
-        quote = fetch_latest_quote(ticker.upper())
+        quote = cached_fetch_latest_quote(ticker.upper())
 
         return jsonify(
             {
@@ -89,12 +176,18 @@ def get_quote(ticker):
 
 @app.route("/api/historical/<ticker>", methods=["GET"])
 def get_historical(ticker):
-    """Get historical price data for charting with Swedish timezone."""
-    import yfinance as yf
+    """
+    Get historical price data for charting (UTC epoch-second timestamps).
 
+    Query params:
+        period, interval: yfinance period/interval (interval derived if omitted)
+        format: "rows" (default, list of candle objects) or "columnar"
+            (parallel time/open/high/low/close/volume arrays, ~4x smaller)
+    """
     try:
         period = request.args.get("period", "5d")
         interval = request.args.get("interval", None)
+        columnar = request.args.get("format", "rows") == "columnar"
 
         if not interval:
             interval_map = {
@@ -120,8 +213,7 @@ def get_historical(ticker):
         }
         fetch_period = fetch_map.get(period, period)
 
-        yf_ticker = yf.Ticker(ticker.upper())
-        hist = yf_ticker.history(period=fetch_period, interval=interval)
+        hist = _fetch_history(ticker.upper(), fetch_period, interval)
 
         if hist.empty:
             return jsonify({"error": f"No data for {ticker}"}), 404
@@ -138,49 +230,65 @@ def get_historical(ticker):
             if tail_count:
                 hist = hist.tail(tail_count)
 
-        # Convert to Swedish timezone
-        swedish_tz = pytz.timezone("Europe/Stockholm")
-        data = []
-
-        for index, row in hist.iterrows():
-            try:
-                if pd.isna(row["Close"]) or pd.isna(row["Open"]) or row["Close"] == 0:
-                    continue
-
-                # Convert to Swedish time
-                if index.tz is None:  # type: ignore
-                    utc_time = index.tz_localize("UTC")  # type: ignore
-                else:
-                    utc_time = index.tz_convert("UTC")  # type: ignore
-                swedish_time = utc_time.tz_convert(swedish_tz)
-
-                data.append(
-                    {
-                        "time": int(swedish_time.timestamp()),
-                        "open": float(row["Open"]),
-                        "high": float(row["High"]),
-                        "low": float(row["Low"]),
-                        "close": float(row["Close"]),
-                        "volume": int(row["Volume"])
-                        if "Volume" in row and not pd.isna(row["Volume"])
-                        else 0,
-                    }
-                )
-            except Exception:
-                continue
+        # Epoch seconds are timezone-independent: a tz-aware index already
+        # stores UTC nanoseconds and a naive one is UTC from yfinance, so no
+        # localize/convert pass is needed (the chart localizes for display).
+        times = hist.index.as_unit("ns").asi8 // 10**9  # type: ignore
+
+        # Parallel float64 arrays (float32 would round real prices), then one
+        # boolean mask drops unusable candles from every column at once.
+        opens = hist["Open"].to_numpy(dtype=np.float64)
+        highs = hist["High"].to_numpy(dtype=np.float64)
+        lows = hist["Low"].to_numpy(dtype=np.float64)
+        closes = hist["Close"].to_numpy(dtype=np.float64)
+        if "Volume" in hist:
+            volumes = np.nan_to_num(hist["Volume"].to_numpy(dtype=np.float64))
+            volumes = volumes.astype(np.int64)
+        else:
+            volumes = np.zeros(len(hist), dtype=np.int64)
+
+        mask = ~np.isnan(opens) & ~np.isnan(closes) & (closes != 0)
+        times, opens, highs, lows, closes, volumes = (
+            col[mask] for col in (times, opens, highs, lows, closes, volumes)
+        )
 
-        if not data:
+        if len(times) == 0:
             return jsonify({"error": "No valid data"}), 404
 
-        log.info(f"Returning {len(data)} candles for {ticker}")
-        return jsonify(
-            {
-                "ticker": ticker.upper(),
-                "period": period,
-                "interval": interval,
-                "data": data,
-            }
-        )
+        # Between bar updates the series is unchanged: tag it by its newest
+        # candle (the live bar's close/volume still move within the bar).
+        etag = hashlib.md5(
+            f"{ticker.upper()}|{period}|{interval}|{columnar}|{len(times)}|"
+            f"{times[-1]}|{closes[-1]}|{volumes[-1]}".encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+
+        log.info(f"Returning {len(times)} candles for {ticker}")
+        payload = {"ticker": ticker.upper(), "period": period, "interval": interval}
+
+        if columnar:
+            payload.update(
+                time=times,
+                open=opens,
+                high=highs,
+                low=lows,
+                close=closes,
+                volume=volumes,
+            )
+        else:
+            columns = (times, opens, highs, lows, closes, volumes)
+            payload["data"] = [
+                {"time": t, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+                for t, o, h, lo, c, v in zip(*(col.tolist() for col in columns))
+            ]
+
+        response = jsonify(payload)
+        response.set_etag(etag)
+        return response
 
     except Exception as e:
         log.exception("Error fetching historical")
@@ -209,22 +317,33 @@ def get_portfolio():
         total_value = portfolio.cash
         holdings_with_prices = {}
 
+        # One batched download for all holdings; per-ticker quotes only for
+        # tickers missing from the batch response (fetched concurrently).
+        prices = fetch_latest_prices(portfolio.holdings.keys())
+        missing = [t for t in portfolio.holdings if t not in prices]
+        if missing:
+            prices.update(
+                fetch_prices_concurrently(
+                    missing, fetch=cached_fetch_latest_quote, executor=QUOTE_POOL
+                )
+            )
+
         for ticker, qty in portfolio.holdings.items():
-            try:
-                quote = fetch_latest_quote(ticker)
-                price = float(quote.price)
-                total_value += qty * price
-                holdings_with_prices[ticker] = {
-                    "quantity": qty,
-                    "current_price": price,
-                    "value": qty * price,
-                }
-            except QuoteFetchError:
+            price = prices.get(ticker)
+            if price is None:
                 holdings_with_prices[ticker] = {
                     "quantity": qty,
                     "current_price": None,
                     "value": 0,
                 }
+                continue
+
+            total_value += qty * price
+            holdings_with_prices[ticker] = {
+                "quantity": qty,
+                "current_price": price,
+                "value": qty * price,
+            }
 
         return jsonify(
             {
@@ -276,27 +395,29 @@ def execute_trade():
         if not ticker or quantity <= 0:
             return jsonify({"error": "Invalid ticker or quantity"}), 400
 
-        # Get current market price
-        quote = fetch_latest_quote(ticker)
+        # Get current market price (always fresh for trades)
+        quote = cached_fetch_latest_quote(ticker, ttl=0)
         price = float(quote.price)
 
         # Use limit price if specified
         if order_type == "limit" and limit_price:
             price = float(limit_price)
 
-        # Load portfolio and execute trade
-        portfolio = load_portfolio()
+        with _trade_lock:
+            # Load portfolio and execute trade
+            portfolio = load_portfolio()
 
-        # Create TransactionManager instance for this trade
-        tm = TransactionManager(portfolio=portfolio, snapshot_store=SnapshotStore())
+            # Create TransactionManager instance for this trade
+            tm = TransactionManager(portfolio=portfolio, snapshot_store=SnapshotStore())
 
-        if action == "buy":
-            tm.buy(ticker, quantity)
-        else:
-            tm.sell(ticker, quantity)
+            if action == "buy":
+                tm.buy(ticker, quantity)
+            else:
+                tm.sell(ticker, quantity)
 
-        # Save portfolio
-        save_portfolio(portfolio)
+            # Save before responding so any later request (in any process)
+            # loads the post-trade file
+            save_portfolio(portfolio)
 
         # Calculate total from transaction
         total = quantity * price
@@ -378,7 +499,7 @@ if __name__ == "__main__":
 
     # Ensure data directory exists
     try:
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        ensure_data_dir()
         log.info(f"Data directory ready: {DATA_DIR}")
     except Exception as e:
         log.error(f"Failed to create data directory: {e}")
@@ -391,4 +512,9 @@ if __name__ == "__main__":
     print(f"💾 Data directory: {DATA_DIR}")
     print("=" * 60 + "\n")
 
-    app.run(debug=True, port=5000, host="0.0.0.0")
+    # Werkzeug dev server: debugger/reloader only with DEV=1. Production runs
+    # under gunicorn (see gunicorn_conf.py).
+    dev = os.environ.get("DEV") == "1"
+    if not dev:
+        print("Tip: run 'gunicorn -c gunicorn_conf.py api_server:app' in production")
+    app.run(debug=dev, port=5000, host="0.0.0.0", threaded=True)
@@ -0,0 +1,27 @@
+"""
+Gunicorn settings for serving the STOCK SIMULATOR Chart API.
+
+Usage (Linux/macOS):
+    gunicorn -c gunicorn_conf.py api_server:app
+
+- gthread workers: quote/history calls are I/O bound, threads overlap them
+- preload_app: yfinance/pandas are imported once in the master and shared
+  copy-on-write by all workers
+- One worker by default, scaled with threads: trades are serialized by an
+  in-process lock, and the portfolio file has no cross-process locking, so
+  several workers could interleave load/save and lose a trade
+- Worker/thread counts can be tuned with GUNICORN_WORKERS / GUNICORN_THREADS
+  (only raise GUNICORN_WORKERS for read-mostly deployments)
+
+Caches (quotes, history) live per worker process; the portfolio file itself
+is shared by all workers.
+"""
+
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "1"))
+threads = int(os.environ.get("GUNICORN_THREADS", "16"))
+worker_class = "gthread"
+preload_app = True
+timeout = 30
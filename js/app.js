@@ -534,7 +534,7 @@
                 const timeoutId = setTimeout(() => controller.abort(), 15000); // 15 second timeout
                 
                 const response = await fetch(
-                    `${API_BASE}/historical/${symbol}?period=${period}&interval=${interval}`,
+                    `${API_BASE}/historical/${symbol}?period=${period}&interval=${interval}&format=columnar`,
                     { signal: controller.signal }
                 );
                 
@@ -547,11 +547,19 @@
                 
                 const result = await response.json();
                 
-                if (!result.data || result.data.length === 0) {
+                if (!result.time || result.time.length === 0) {
                     throw new Error('No data returned from API');
                 }
                 
-                return result.data;
+                // Columnar payload -> candle objects for the chart library
+                return result.time.map((time, i) => ({
+                    time,
+                    open: result.open[i],
+                    high: result.high[i],
+                    low: result.low[i],
+                    close: result.close[i],
+                    volume: result.volume[i]
+                }));
             } catch (error) {
                 if (error.name === 'AbortError') {
                     console.error('Request timeout - data fetch took too long');
@@ -10,21 +10,29 @@ Analytics for simple P/L calculation (TR-241).
 
 from __future__ import annotations
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterable, Optional
+import numpy as np
 import pandas as pd
+from src import json_utils
 from src.config import TRANSACTIONS_FILE
-from src.data_fetcher import QuoteFetchError, fetch_latest_quote
+from src.data_fetcher import QuoteFetchError, fetch_latest_prices, fetch_latest_quote
 from src.logger import get_logger
+from src.transaction_logger import (
+    migrate_legacy_transactions,
+    read_transaction_records,
+)
 
 log = get_logger(__name__)
 
 
 def load_transactions_df(path: Path | None = None) -> pd.DataFrame:
     """
-    Load transaction history (JSON/CSV) into a DataFrame.
+    Load transaction history (JSON Lines/JSON/CSV) into a DataFrame.
     Returns empty DataFrame if file is missing/invalid (no crash).
     """
     path = path or TRANSACTIONS_FILE
+    if path.suffix.lower() == ".jsonl":
+        migrate_legacy_transactions(path)
 
     if not path.exists():
         return pd.DataFrame()
@@ -33,8 +41,15 @@ def load_transactions_df(path: Path | None = None) -> pd.DataFrame:
         # Support both JSON and CSV (TR-241)
         if path.suffix.lower() == ".csv":
             df = pd.read_csv(path)
+        elif path.suffix.lower() == ".jsonl":
+            df = _records_to_frame(read_transaction_records(path))
         else:
-            df = pd.read_json(path)
+            # Flat list of records: parse once, skip read_json's type sniffing
+            data = json_utils.loads(path.read_bytes())
+            if isinstance(data, list):
+                df = pd.DataFrame.from_records(data)
+            else:
+                df = pd.DataFrame(data)
     except Exception as e:
         log.error("Could not read transactions file %s: %s", path, e)
         return pd.DataFrame()
@@ -46,6 +61,33 @@ def load_transactions_df(path: Path | None = None) -> pd.DataFrame:
     return normalize_transactions_df(df)
 
 
+def _records_to_frame(records: list[dict[str, Any]]) -> pd.DataFrame:
+    """
+    Build a DataFrame with only the columns compute_pl needs, one column
+    list at a time (no per-record row objects, no unused columns).
+    """
+    if not records:
+        return pd.DataFrame()
+    return pd.DataFrame(
+        {
+            "ticker": [r.get("ticker") for r in records],
+            "side": [r.get("side", r.get("kind")) for r in records],
+            "quantity": [r.get("quantity") for r in records],
+            "price": [r.get("price") for r in records],
+        }
+    )
+
+
+def _strip_upper(col: pd.Series) -> pd.Series:
+    """
+    str(x).strip().upper() per value, computed once per distinct value:
+    histories repeat a handful of tickers/sides across many rows.
+    """
+    codes, uniques = pd.factorize(col, use_na_sentinel=False)
+    cleaned = np.array([str(v).strip().upper() for v in uniques], dtype=object)
+    return pd.Series(cleaned[codes], index=col.index)
+
+
 def normalize_transactions_df(df: pd.DataFrame) -> pd.DataFrame:
     """
     Normalize to the schema compute_pl expects:
@@ -66,8 +108,8 @@ def normalize_transactions_df(df: pd.DataFrame) -> pd.DataFrame:
         return pd.DataFrame()
 
     # Convert types + normalize casing (defensive parsing)
-    df["ticker"] = df["ticker"].astype(str).str.strip().str.upper()
-    df["side"] = df["side"].astype(str).str.strip().str.upper()
+    df["ticker"] = _strip_upper(df["ticker"])
+    df["side"] = _strip_upper(df["side"])
     df["quantity"] = pd.to_numeric(df["quantity"], errors="coerce")
     df["price"] = pd.to_numeric(df["price"], errors="coerce")
 
@@ -85,10 +127,15 @@ def compute_pl(
     tx_path: Path | None = None,
     latest_prices: dict[str, float] | None = None,
     price_fetcher: Callable[[str], Any] = fetch_latest_quote,
+    batch_price_fetcher: Optional[Callable[[Iterable[str]], dict[str, float]]] = None,
 ) -> dict[str, Any]:
     """
     Compute P/L using a simple average cost model (TR-241).
     Returns dict (presentation via CLI).
+
+    Missing latest prices are fetched in one batch first (batch_price_fetcher,
+    defaulting to fetch_latest_prices when the default price_fetcher is used);
+    price_fetcher is the per-ticker fallback for anything the batch missed.
     """
     # If caller doesn't pass a DF, load from default transactions file.
     df = df if df is not None else load_transactions_df(tx_path)
@@ -111,8 +158,23 @@ def compute_pl(
     total_qty: dict[str, float] = {}
     realized_pl = 0.0
 
+    # Average cost is only order-dependent for tickers that have sells.
+    has_sells = df["ticker"].isin(df.loc[df["side"] == "SELL", "ticker"].unique())
+
+    # --- Buy-only tickers: cost basis is a plain sum (one groupby) ---
+    buys_only = df[~has_sells]
+    if not buys_only.empty:
+        sums = (
+            buys_only.assign(cost=buys_only["quantity"] * buys_only["price"])
+            .groupby("ticker", sort=False)[["cost", "quantity"]]
+            .sum()
+            .astype(float)
+        )
+        total_cost.update(sums["cost"].to_dict())
+        total_qty.update(sums["quantity"].to_dict())
+
     # --- Realized P/L: apply sells against current average cost ---
-    for row in df.itertuples(index=False):
+    for row in df[has_sells].itertuples(index=False):
         ticker = row.ticker
         side = row.side
         qty = float(row.quantity)
@@ -143,8 +205,17 @@ def compute_pl(
     unrealized_pl = 0.0
     per_ticker: dict[str, Any] = {}
 
+    # One batched request for every open position without a known price.
+    if batch_price_fetcher is None and price_fetcher is fetch_latest_quote:
+        batch_price_fetcher = fetch_latest_prices
+    need = [t for t, q in total_qty.items() if q > 0 and t not in latest_prices]
+    if need and batch_price_fetcher is not None:
+        latest_prices.update(batch_price_fetcher(need))
+
     # --- Unrealized P/L: value remaining holdings at latest price ---
-    for ticker, qty_left in total_qty.items():
+    # Walk tickers in first-seen order so per_ticker keeps the history order.
+    for ticker in df["ticker"].unique():
+        qty_left = total_qty.get(ticker, 0.0)
         if qty_left <= 0:
             continue
 
@@ -12,7 +12,7 @@ from typing import Optional, Any, Dict
 from src.validators import validate_ticker
 
 
-@dataclass
+@dataclass(slots=True)
 class Asset:
     """
     Represents a financial asset (e.g., a stock).
@@ -52,10 +52,11 @@ class Asset:
         """
         Updates the price and timestamp of the asset.
         """
-        if new_price < 0:
+        price = float(new_price)
+        if price < 0:
             raise ValueError(f"Price cannot be negative: {new_price}")
 
-        self.price = float(new_price)
+        self.price = price
         self.timestamp = timestamp if timestamp else datetime.now(timezone.utc)
 
     def to_dict(self) -> Dict[str, Any]:
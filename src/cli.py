@@ -1,63 +1,26 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import logging
+import os
 import sys
-import json
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict
 
 from json import JSONDecodeError
 
-
-# Data fetch och errors
-from src.transactions import (
-    TransactionManager,
-    TransactionError,
-    MarketClosedError,
-    InsufficientFundsError,
-    InsufficientHoldingsError,
-)
-from src.data_fetcher import QuoteFetchError, fetch_latest_quote
-
-# Portfolio, config, errors, validators, formatters
+# Lightweight imports only (stdlib + small src modules), so building the
+# parser, --help and argument errors never pay for yfinance/pandas; each
+# cmd_* imports the domain modules it needs.
+from src import json_utils
 from src.portfolio import Portfolio
 from src.config import DATA_DIR
 from src.errors import FileError, ValidationError
 from src.validators import validate_ticker, validate_positive_float
-from src.formatters import format_portfolio_output
-from src.snapshot_store import SnapshotStore
-
-# Analytics
-from src.analytics import compute_pl
-
-# Reporting
-from src.reporting import generate_and_write_report
-
-try:
-    from src.logger import init_logging, get_logger
-
-    log = get_logger(__name__)
-
-except Exception:  # pragma: no cover
-    # Fallback if src.logger is not available yet
-    import logging
-
-    def init_logging(
-        *,
-        level: str = "INFO",
-        log_file: str | Path = "logs/app.log",
-        console: bool = True,
-        max_bytes: int = 2000000,
-        backup_count: int = 5,
-    ) -> None:
-        """Initialize basic logging."""
-        logging.basicConfig(level=level)
 
-    def get_logger(name: str):
-        """Get a logger instance."""
-        return logging.getLogger(name)
-
-    log = get_logger(__name__)
+log = logging.getLogger(__name__)
 
 PORTFOLIO_FILE = DATA_DIR / "portfolio.json"
 
@@ -70,8 +33,8 @@ def load_portfolio(path: Path = PORTFOLIO_FILE) -> Portfolio:
         return Portfolio()
 
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # Full read + one parse (orjson when available) beats stream decoding
+        data = json_utils.loads(path.read_bytes())
 
         p = Portfolio()
         p.cash = float(data.get("cash", 10000.0))
@@ -87,55 +50,143 @@ def load_portfolio(path: Path = PORTFOLIO_FILE) -> Portfolio:
         return Portfolio()  # Return empty instead of crashing
 
 
+# Digest of the last payload written per path (+ the file's mtime/size right
+# after writing), so saving an unchanged portfolio costs one stat() instead
+# of a rewrite.
+_last_saved: Dict[Path, tuple[bytes, int, int]] = {}
+
+
+def _log_unexpected(message: str, exc: BaseException) -> None:
+    """
+    Log an unexpected command error.
+
+    The one-line error is always logged; the traceback only when DEBUG is
+    enabled, so error storms do not pay for stack formatting.
+    """
+    log.error("%s: %s", message, exc)
+    log.debug("%s", message, exc_info=exc)
+
+
+def _payload_digest(payload: bytes) -> bytes:
+    """Short content digest used to detect unchanged saves."""
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
 def save_portfolio(portfolio: Portfolio, path: Path = PORTFOLIO_FILE) -> None:
-    """Save the portfolio to disk as JSON."""
+    """
+    Save the portfolio to disk as JSON.
+
+    Writes to a temp file and os.replace()s it over the target, so a crash
+    never leaves a half-written portfolio. Skips the write when the content
+    is identical to the last save and the file has not changed since.
+    """
+    payload = json_utils.dumps(portfolio.to_dict(), indent=True) + b"\n"
+
+    digest = _payload_digest(payload)
+    previous = _last_saved.get(path)
+    if previous is not None and previous[0] == digest:
+        try:
+            st = path.stat()
+            if (st.st_mtime_ns, st.st_size) == previous[1:]:
+                log.debug("Portfolio unchanged, skipping save to %s", path)
+                return
+        except OSError:
+            pass  # file gone -> write it again
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(portfolio.to_dict(), f, indent=4)
+        # One unbuffered write + fsync, then the rename publishes it atomically
+        with open(tmp_path, "wb", buffering=0) as f:
+            f.write(payload)
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        st = path.stat()
+        _last_saved[path] = (digest, st.st_mtime_ns, st.st_size)
         log.info("Saved portfolio to %s", path)
     except OSError as exc:
+        _last_saved.pop(path, None)
         log.error("Failed to save portfolio file: %s", path, exc_info=True)
         raise FileError(f"Could not save portfolio file: {path}") from exc
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """
-    Create and return the CLI argument parser.
-    """
-    parser = argparse.ArgumentParser(prog="stock-sim")
-    parser.add_argument(
-        "--log-level", default="INFO", help="DEBUG|INFO|WARNING|ERROR|CRITICAL"
-    )
+def _add_quote_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("ticker", help="Ticker symbol, e.g. AAPL")
 
-    sub = parser.add_subparsers(dest="command", required=True)
 
-    q = sub.add_parser("quote", help="Fetch the latest price for a ticker.")
-    q.add_argument("ticker", help="Ticker symbol, e.g. AAPL")
+def _add_sell_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("ticker", help="Ticker symbol to sell, e.g. AAPL")
+    p.add_argument("quantity", type=float, help="Number of shares to sell")
 
-    s = sub.add_parser("sell", help="Sell an asset from the portfolio.")
-    s.add_argument("ticker", help="Ticker symbol to sell, e.g. AAPL")
-    s.add_argument("quantity", type=float, help="Number of shares to sell")
 
-    b = sub.add_parser("buy", help="Buy an asset and add to the portfolio.")
-    b.add_argument("ticker", help="Ticker symbol to buy, e.g. AAPL")
-    b.add_argument("quantity", type=float, help="Number of shares to buy")
+def _add_buy_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("ticker", help="Ticker symbol to buy, e.g. AAPL")
+    p.add_argument("quantity", type=float, help="Number of shares to buy")
 
-    sub.add_parser(
-        "portfolio", help="Show portfolio status (cash, holdings, total value)."
-    )
 
-    sub.add_parser(
-        "analytics", help="Show Profit/Loss (realized + unrealized) from transactions."
+def _add_report_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--recent", type=int, default=5, help="Include last N trades (default: 5)"
     )
 
-    r = sub.add_parser("report", help="Generate a daily trade report to data.")
-    r.add_argument(
-        "--recent", type=int, default=5, help="Include last N trades (default: 5)"
+
+# command -> (help, argument builder or None)
+_COMMANDS: dict[str, tuple[str, Any]] = {
+    "quote": ("Fetch the latest price for a ticker.", _add_quote_args),
+    "sell": ("Sell an asset from the portfolio.", _add_sell_args),
+    "buy": ("Buy an asset and add to the portfolio.", _add_buy_args),
+    "portfolio": ("Show portfolio status (cash, holdings, total value).", None),
+    "analytics": (
+        "Show Profit/Loss (realized + unrealized) from transactions.",
+        None,
+    ),
+    "report": ("Generate a daily trade report to data.", _add_report_args),
+    "save": ("Manually save the current portfolio to disk.", None),
+    "load": ("Manually reload the portfolio from disk.", None),
+}
+
+
+def _selected_command(argv: list[str]) -> str | None:
+    """Return the subcommand named in argv (skipping --log-level's value)."""
+    skip_next = False
+    for arg in argv:
+        if skip_next:
+            skip_next = False
+        elif arg == "--log-level":
+            skip_next = True
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def build_parser(argv: list[str] | None = None) -> argparse.ArgumentParser:
+    """
+    Return the CLI argument parser.
+
+    Every subcommand is registered (for --help and choices), but when argv
+    is given only the selected subcommand gets its arguments added.
+    Parsers are built once per selected command and reused (parse_args does
+    not mutate them), which keeps repeated main() calls cheap.
+    """
+    if argv is None:
+        return _cached_parser(None, full=True)
+    selected = _selected_command(argv)
+    return _cached_parser(selected if selected in _COMMANDS else None, full=False)
+
+
+@functools.cache
+def _cached_parser(selected: str | None, *, full: bool) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="stock-sim")
+    parser.add_argument(
+        "--log-level", default="INFO", help="DEBUG|INFO|WARNING|ERROR|CRITICAL"
     )
 
-    sub.add_parser("save", help="Manually save the current portfolio to disk.")
-    sub.add_parser("load", help="Manually reload the portfolio from disk.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name, (help_text, add_args) in _COMMANDS.items():
+        p = sub.add_parser(name, help=help_text)
+        if add_args is not None and (full or name == selected):
+            add_args(p)
 
     return parser
 
@@ -144,42 +195,17 @@ def cmd_quote(ticker_raw: str) -> int:
     """
     Execute the quote command.
     """
+    from src.data_fetcher import QuoteFetchError, fetch_latest_quote
+    from src.formatters import format_market_warning, format_quote_line
+
     try:
         ticker = validate_ticker(ticker_raw)
         quote = fetch_latest_quote(ticker)
 
-        currency = getattr(quote, "currency", "UNKNOWN")
-        price_native = f"{quote.price:.2f}"
-
-        local_ts = quote.timestamp.astimezone()
-        ts_str = local_ts.strftime("%Y-%m-%d %H:%M:%S %Z")
-
-        name_part = (
-            f" ({quote.company_name})" if getattr(quote, "company_name", None) else ""
-        )
-        price_sek_val = getattr(quote, "price_sek", None)
-
-        if price_sek_val is not None:
-            price_sek = f"{float(price_sek_val):.2f}"
-
-            fx_pair = getattr(quote, "fx_pair", None)
-            fx_rate = getattr(quote, "fx_rate_to_sek", None)
-            fx_part = ""
-            if fx_pair and fx_rate:
-                fx_part = f" (FX: {fx_pair} {float(fx_rate):.4f})"
-
-            print(
-                f"{quote.ticker}{name_part} "
-                f"{price_native} {currency} | {price_sek} SEK "
-                f"(Fetched at: {ts_str}){fx_part}"
-            )
-        else:
-            print(
-                f"{quote.ticker}{name_part} "
-                f"{price_native} {currency} | SEK: N/A "
-                f"(Fetched at: {ts_str})"
-            )
-
+        warning = format_market_warning(quote)
+        if warning:
+            print(warning)
+        print(format_quote_line(quote))
         return 0
 
     except ValidationError as e:
@@ -195,7 +221,7 @@ def cmd_quote(ticker_raw: str) -> int:
         print(f"File Error: {exc}", file=sys.stderr)
         return 1
     except Exception as exc:
-        log.exception("Unexpected CLI error")
+        _log_unexpected("Unexpected CLI error", exc)
         print(f"Error: Unexpected error: {exc}", file=sys.stderr)
         return 0
 
@@ -204,6 +230,14 @@ def cmd_buy(ticker_raw: str, quantity: float) -> int:
     """
     Execute the buy command via TransactionManager (includes market check).
     """
+    from src.snapshot_store import SnapshotStore
+    from src.transactions import (
+        InsufficientFundsError,
+        MarketClosedError,
+        TransactionError,
+        TransactionManager,
+    )
+
     try:
         ticker = validate_ticker(ticker_raw)
         valid_quantity = validate_positive_float(str(quantity))
@@ -237,7 +271,7 @@ def cmd_buy(ticker_raw: str, quantity: float) -> int:
         print(f"File Error: {exc}", file=sys.stderr)
         return 1
     except Exception as exc:
-        log.exception("Unexpected error during buy command")
+        _log_unexpected("Unexpected error during buy command", exc)
         print(f"System Error: {exc}", file=sys.stderr)
         return 1
 
@@ -246,6 +280,14 @@ def cmd_sell(ticker_raw: str, quantity: float) -> int:
     """
     Execute the sell command via TransactionManager (includes market check).
     """
+    from src.snapshot_store import SnapshotStore
+    from src.transactions import (
+        InsufficientHoldingsError,
+        MarketClosedError,
+        TransactionError,
+        TransactionManager,
+    )
+
     try:
         ticker = validate_ticker(ticker_raw)
         valid_quantity = validate_positive_float(str(quantity))
@@ -281,21 +323,31 @@ def cmd_sell(ticker_raw: str, quantity: float) -> int:
         print(f"File Error: {exc}", file=sys.stderr)
         return 1
     except Exception as exc:
-        log.exception("Unexpected error during sell command")
+        _log_unexpected("Unexpected error during sell command", exc)
         print(f"System Error: {exc}", file=sys.stderr)
         return 1
 
 
 def cmd_portfolio() -> int:
+    from src.data_fetcher import (
+        fetch_latest_prices,
+        fetch_latest_quote,
+        fetch_prices_concurrently,
+    )
+    from src.formatters import format_portfolio_output
+
     try:
         portfolio = load_portfolio()
-        price_map: Dict[str, float] = {}
-        for ticker in portfolio.holdings.keys():
-            try:
-                quote = fetch_latest_quote(ticker)
-                price_map[ticker] = float(quote.price)
-            except QuoteFetchError as exc:
-                log.warning("Price fetch failed for %s: %s", ticker, exc)
+        # One batched download for all holdings; parallel per-ticker fetches
+        # (bounded to 20s in total) only for symbols the batch could not price.
+        batch = fetch_latest_prices(portfolio.holdings)
+        missing = [t for t in portfolio.holdings if t not in batch]
+        fallback = (
+            fetch_prices_concurrently(missing, fetch=fetch_latest_quote)
+            if missing
+            else {}
+        )
+        price_map: Dict[str, float] = {**batch, **fallback}
         output = format_portfolio_output(portfolio, price_map)
         print(output)
         return 0
@@ -303,7 +355,7 @@ def cmd_portfolio() -> int:
         print(f"File Error: {exc}", file=sys.stderr)
         return 1
     except Exception as exc:
-        log.exception("Unexpected error during portfolio command")
+        _log_unexpected("Unexpected error during portfolio command", exc)
         print(f"System error: {exc}", file=sys.stderr)
         return 1
 
@@ -313,12 +365,14 @@ def cmd_analytics() -> int:
     Execute the analytics command (TR-241).
     Prints a simple dict for now (presentation via CLI).
     """
+    from src.analytics import compute_pl
+
     try:
         result = compute_pl()
         print(result)
         return 0
     except Exception as exc:
-        log.exception("Unexpected error during analytics command")
+        _log_unexpected("Unexpected error during analytics command", exc)
         print(f"System error: {exc}", file=sys.stderr)
         return 1
 
@@ -329,6 +383,9 @@ def cmd_report(recent: int = 5) -> int:
 
     Writes a text report to data/report_YYYY-MM-DD.txt.
     """
+    from src.data_fetcher import fetch_latest_prices, fetch_latest_quote
+    from src.reporting import generate_and_write_report
+
     try:
         portfolio = load_portfolio()
 
@@ -340,6 +397,7 @@ def cmd_report(recent: int = 5) -> int:
             portfolio=portfolio,
             price_provider=price_provider,
             recent_n=recent,
+            batch_price_provider=fetch_latest_prices,
         )
 
         print(f"Report written to {out_path}")
@@ -350,7 +408,7 @@ def cmd_report(recent: int = 5) -> int:
         return 1
 
     except Exception as exc:
-        log.exception("Unexpected error during report command")
+        _log_unexpected("Unexpected error during report command", exc)
         print(f"System error: {exc}", file=sys.stderr)
         return 1
 
@@ -368,7 +426,7 @@ def cmd_save() -> int:
         print(f"Error saving: {e}", file=sys.stderr)
         return 1
     except Exception as exc:
-        log.exception("Unexpected error during save")
+        _log_unexpected("Unexpected error during save", exc)
         print(f"System Error: {exc}", file=sys.stderr)
         return 1
 
@@ -383,7 +441,7 @@ def cmd_load() -> int:
         print(f"Holdings: {len(portfolio.holdings)} assets")
         return 0
     except Exception as exc:
-        log.exception("Unexpected error during load")
+        _log_unexpected("Unexpected error during load", exc)
         print(f"System Error: {exc}", file=sys.stderr)
         return 1
 
@@ -392,7 +450,10 @@ def main(argv: list[str] | None = None) -> int:
     """
     CLI entrypoint.
     """
-    args = build_parser().parse_args(argv)
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser(argv).parse_args(argv)
+
+    from src.logger import init_logging
 
     init_logging(level=args.log_level)
     log.info("CLI start command=%s", args.command)
@@ -7,24 +7,39 @@ import os
 from pathlib import Path
 
 #   Base directory of the project
-#   resolve the directory of this file (src/config.py)
+#   absolute path of this file (src/config.py); abspath is pure string work,
+#   unlike resolve() which walks every path component with syscalls
 #  .parent gives us 'src/'
 #  .parent.parent gives us the root directory of the project 'StockSimulator/'
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PROJECT_ROOT = Path(os.path.abspath(__file__)).parent.parent
 
 # Define standard paths
+# Only a user-supplied override (relative, ~, symlinks) needs resolving.
 _env_data_dir = os.getenv("STOCKSIM_DATA_DIR")
 DATA_DIR = (
-    Path(_env_data_dir).expanduser() if _env_data_dir else (PROJECT_ROOT / "data")
-).resolve()
+    Path(_env_data_dir).expanduser().resolve()
+    if _env_data_dir
+    else PROJECT_ROOT / "data"
+)
 SRC_DIR = PROJECT_ROOT / "src"
 TESTS_DIR = PROJECT_ROOT / "tests"
 SNAPSHOTS_FILE = DATA_DIR / "snapshots.csv"
-TRANSACTIONS_FILE = DATA_DIR / "transactions.json"
+# Append-only JSON Lines history; the old JSON-list file is migrated on first use
+TRANSACTIONS_FILE = DATA_DIR / "transactions.jsonl"
+LEGACY_TRANSACTIONS_FILE = DATA_DIR / "transactions.json"
 MOCK_PRICES_FILE = DATA_DIR / "mock_prices.json"
 
-# Ensure directories exist
-DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+def ensure_data_dir() -> Path:
+    """
+    Create DATA_DIR if missing and return it.
+
+    Called by code that writes into DATA_DIR, so importing config (e.g. for
+    `--help`) does not touch the filesystem.
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    return DATA_DIR
+
 
 # for debugging purposes only
 if __name__ == "__main__":
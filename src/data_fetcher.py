@@ -6,42 +6,100 @@ Helpers for fetching market data (quotes, candles, etc.).
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
-from dataclasses import dataclass
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 import yfinance as yf
+from yfinance.exceptions import YFTickerMissingError
 
-from src.config import MOCK_PRICES_FILE
+from src import json_utils
+from src.config import DATA_DIR, MOCK_PRICES_FILE, ensure_data_dir
 
 
 logger = logging.getLogger(__name__)
 
 
-def get_market_state(ticker: str) -> str:
+# Ticker.info is one Yahoo round-trip and feeds the market state, currency and
+# company name of a quote; fetch it once per ticker and reuse it for a minute.
+INFO_TTL_SECONDS = 60.0
+_info_cache: dict[str, tuple[float, dict]] = {}  # ticker -> (monotonic, info)
+_info_lock = threading.Lock()
+
+# FX rates per pair (e.g. USDSEK=X) -> (monotonic, rate); failures not cached.
+FX_TTL_SECONDS = 900.0
+_fx_cache: dict[str, tuple[float, float]] = {}
+_fx_lock = threading.Lock()
+
+# Runs the per-quote metadata lookups (info + FX) next to the price lookup.
+_META_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="quote-meta")
+
+
+def _get_info(ticker: str) -> dict:
     """
-    Fetch the current market state from yfinance.
-    Returns 'REGULAR', 'CLOSED', 'PRE', 'POST', 'PREPRE', etc.
-    Returns 'UNKNOWN' if fetch fails.
+    Return yfinance Ticker.info for ticker, cached for INFO_TTL_SECONDS.
+    Returns {} if the lookup fails (failures are not cached).
     """
+    now = time.monotonic()
+    with _info_lock:
+        entry = _info_cache.get(ticker)
+    if entry is not None and now - entry[0] < INFO_TTL_SECONDS:
+        return entry[1]
+
     try:
         yf_ticker = yf.Ticker(ticker)
-        info = yf_ticker.info
-        state = info.get("marketState", "UNKNOWN")
-        return state
+        # Some yfinance versions provide get_info(); otherwise .info is common.
+        if hasattr(yf_ticker, "get_info"):
+            info = yf_ticker.get_info()
+        else:
+            info = getattr(yf_ticker, "info", None)
     except Exception:
-        logger.warning("Could not fetch marketState for %s", ticker, exc_info=True)
-        return "UNKNOWN"
+        logger.warning("Could not fetch info for %s", ticker, exc_info=True)
+        return {}
+
+    if not isinstance(info, dict):
+        return {}
+    with _info_lock:
+        _info_cache[ticker] = (now, info)
+    return info
+
 
+SKIP_MARKET_CHECK_ENV = "STOCKSIM_SKIP_MARKET_CHECK"
 
-def is_market_likely_open(ticker: str) -> bool:
+
+def _skip_market_check() -> bool:
+    """True when STOCKSIM_SKIP_MARKET_CHECK=1 disables the market-closed warning."""
+    return os.getenv(SKIP_MARKET_CHECK_ENV, "").strip() == "1"
+
+
+def get_market_state(ticker: str, info: dict | None = None) -> str:
+    """
+    Fetch the current market state from yfinance.
+    Returns 'REGULAR', 'CLOSED', 'PRE', 'POST', 'PREPRE', etc.
+    Returns 'UNKNOWN' if fetch fails.
+    """
+    if info is None:
+        info = _get_info(ticker)
+    state = info.get("marketState", "UNKNOWN")
+    return state if isinstance(state, str) else "UNKNOWN"
+
+
+def is_market_likely_open(ticker: str, info: dict | None = None) -> bool:
     """
     Returns True if marketState indicates regular trading hours.
     """
-    state = get_market_state(ticker)
+    state = get_market_state(ticker, info)
     return state == "REGULAR"
 
 
@@ -62,16 +120,19 @@ class QuoteFetchError(RuntimeError):
         self.code = code
 
 
+@lru_cache(maxsize=4096)
 def _validate_ticker(ticker: str) -> str:
     if not ticker or not ticker.strip():
         raise QuoteFetchError(
             "Ticker must not be empty",
             code=FetchErrorCode.VALIDATION,
         )
-    return ticker.strip().upper()
+    # Interned: every spelling of a symbol maps to one shared str object, so
+    # cache/price_map lookups hit the identity fast path in dict compares.
+    return sys.intern(ticker.strip().upper())
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Quote:
     """
     A minimal latest-quote representation.
@@ -85,48 +146,285 @@ class Quote:
     price_sek: Optional[float] = None
     fx_pair: Optional[str] = None
     fx_rate_to_sek: Optional[float] = None
+    # yfinance marketState at fetch time (None when the check is skipped)
+    market_state: Optional[str] = None
+
+
+# --- Short-lived quote cache (shared by CLI runs via a JSON file) -----------
+
+QUOTE_TTL_ENV = "STOCKSIM_QUOTE_TTL"
+DEFAULT_QUOTE_TTL_SECONDS = 15.0
+QUOTE_CACHE_FILE = DATA_DIR / "quote_cache.json"
+
+_quote_cache: dict[str, tuple[float, Quote]] = {}  # ticker -> (fetched_at, quote)
+_quote_cache_lock = threading.Lock()
+_quote_cache_loaded = False
+_quote_cache_dirty = False
+_company_names: dict[str, str] = {}
+
+# Single-flight: ticker -> Future of the fetch currently running for it.
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Negative cache: tickers yfinance had no price for -> wall-clock expiry.
+# Persisted with the quotes so a typo'd holding costs one lookup per TTL,
+# not one per CLI run. Network errors are never cached.
+NOT_FOUND_TTL_SECONDS = 300.0
+_NOT_FOUND_KEY = "__not_found__"
+_not_found: dict[str, float] = {}
+
+
+def _quote_ttl() -> float:
+    """Quote cache TTL in seconds from env (0 disables the cache)."""
+    try:
+        return max(0.0, float(os.getenv(QUOTE_TTL_ENV, DEFAULT_QUOTE_TTL_SECONDS)))
+    except ValueError:
+        return DEFAULT_QUOTE_TTL_SECONDS
+
+
+def _load_quote_cache() -> None:
+    """Read quotes persisted by earlier runs (once per process, best effort)."""
+    global _quote_cache_loaded
+    _quote_cache_loaded = True
+    try:
+        raw = json.loads(QUOTE_CACHE_FILE.read_text(encoding="utf-8"))
+        _not_found.update(raw.pop(_NOT_FOUND_KEY, {}))
+        for ticker, (fetched_at, data) in raw.items():
+            data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+            _quote_cache[ticker] = (float(fetched_at), Quote(**data))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        logger.debug("Ignoring unreadable quote cache %s", QUOTE_CACHE_FILE)
+
+
+def _get_cached_quote(ticker: str) -> Quote | None:
+    """Return a cached quote younger than the TTL, else None."""
+    ttl = _quote_ttl()
+    if ttl <= 0:
+        return None
+    with _quote_cache_lock:
+        if not _quote_cache_loaded:
+            _load_quote_cache()
+        entry = _quote_cache.get(ticker)
+    # Wall-clock time (not monotonic) so entries stay valid across runs.
+    if entry is not None and 0 <= time.time() - entry[0] < ttl:
+        return entry[1]
+    return None
+
+
+def _store_cached_quote(quote: Quote) -> None:
+    global _quote_cache_dirty
+    with _quote_cache_lock:
+        _quote_cache[quote.ticker] = (time.time(), quote)
+        _not_found.pop(quote.ticker, None)
+        _quote_cache_dirty = True
+
+
+def _is_known_not_found(ticker: str) -> bool:
+    """True if ticker recently came back without price data."""
+    with _quote_cache_lock:
+        if not _quote_cache_loaded:
+            _load_quote_cache()
+        expires = _not_found.get(ticker)
+    return expires is not None and time.time() < expires
+
+
+def _remember_not_found(ticker: str) -> None:
+    global _quote_cache_dirty
+    with _quote_cache_lock:
+        _not_found[ticker] = time.time() + NOT_FOUND_TTL_SECONDS
+        _quote_cache_dirty = True
+
+
+def _read_quote_cache_file() -> dict:
+    """Raw JSON of the persisted cache ({} when missing or unreadable)."""
+    try:
+        raw = json.loads(QUOTE_CACHE_FILE.read_text(encoding="utf-8"))
+        return raw if isinstance(raw, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        logger.debug("Ignoring unreadable quote cache %s", QUOTE_CACHE_FILE)
+        return {}
 
 
-def fetch_latest_quote(ticker: str) -> Quote:
+@atexit.register
+def _save_quote_cache() -> None:
+    """
+    Persist still-fresh quotes so the next CLI run can reuse them.
+
+    Merged into what other processes saved meanwhile (newest quote per
+    ticker wins) and published with os.replace, so a crash or a concurrent
+    run never leaves a truncated file.
+    """
+    with _quote_cache_lock:
+        if not _quote_cache_dirty:
+            return
+        quotes = dict(_quote_cache)
+        not_found = dict(_not_found)
+
+    now, ttl = time.time(), _quote_ttl()
+    on_disk = _read_quote_cache_file()
+    disk_not_found = on_disk.pop(_NOT_FOUND_KEY, {})
+
+    merged: dict = {}
+    for ticker, entry in on_disk.items():
+        try:
+            if now - float(entry[0]) < ttl:
+                merged[ticker] = entry
+        except (TypeError, ValueError, IndexError):
+            continue
+    for ticker, (fetched_at, quote) in quotes.items():
+        theirs = merged.get(ticker)
+        if now - fetched_at < ttl and (theirs is None or fetched_at >= theirs[0]):
+            merged[ticker] = (fetched_at, asdict(quote))
+
+    if isinstance(disk_not_found, dict):
+        not_found = {**disk_not_found, **not_found}
+    not_found = {
+        t: exp
+        for t, exp in not_found.items()
+        if isinstance(exp, (int, float)) and exp > now and t not in quotes
+    }
+    if not_found:
+        merged[_NOT_FOUND_KEY] = not_found
+
+    tmp_path = QUOTE_CACHE_FILE.with_name(f"{QUOTE_CACHE_FILE.name}.{os.getpid()}.tmp")
+    try:
+        ensure_data_dir()
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(merged, default=str).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, QUOTE_CACHE_FILE)
+    except OSError:
+        logger.debug("Could not write quote cache %s", QUOTE_CACHE_FILE)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def fetch_latest_quote(ticker: str, *, use_cache: bool = True) -> Quote:
     """
     Fetch the latest price for a ticker using yfinance.
+
+    Quotes are reused for STOCKSIM_QUOTE_TTL seconds (default 15, also across
+    CLI runs), and tickers without price data are not looked up again for
+    NOT_FOUND_TTL_SECONDS. Concurrent cached lookups of the same ticker share
+    one upstream fetch. Pass use_cache=False when a fresh price is required
+    (trades).
     """
     ticker = _validate_ticker(ticker)
 
-    if not is_market_likely_open(ticker):
-        print(
-            "Warning: Market appears to be closed for this ticker - showing last known price"
-        )
-        logger.info(
-            "Market likely closed for ticker: %s (marketState: %s)",
-            ticker,
-            get_market_state(ticker),
-        )
+    if use_cache:
+        cached = _get_cached_quote(ticker)
+        if cached is not None:
+            return cached
+        if _is_known_not_found(ticker):
+            raise QuoteFetchError(
+                f"Ticker '{ticker}' not found or has no price data.",
+                code=FetchErrorCode.NOT_FOUND,
+            )
+
+    if not use_cache:
+        return _fetch_uncached(ticker)
+    return _fetch_single_flight(ticker)
+
 
+def _fetch_single_flight(ticker: str) -> Quote:
+    """
+    Fetch ticker once for all threads asking for it at the same time: the
+    first caller does the upstream lookup, the others wait for its result.
+    """
+    with _inflight_lock:
+        future = _inflight.get(ticker)
+        owner = future is None
+        if owner:
+            future = _inflight[ticker] = Future()
+
+    if not owner:
+        return future.result()
+
+    try:
+        quote = _fetch_uncached(ticker)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(quote)
+        return quote
+    finally:
+        with _inflight_lock:
+            _inflight.pop(ticker, None)
+
+
+def _fetch_uncached(ticker: str) -> Quote:
+    """Fetch a fresh quote from yfinance (mock fallback on network errors)."""
+    # Ticker.info and the FX rate are independent of the price lookup: fetch
+    # them on the metadata pool while this thread reads the price.
+    meta = _META_POOL.submit(_fetch_quote_meta, ticker)
+    try:
+        return _fetch_live_quote(ticker, meta)
+    finally:
+        wait([meta])  # never leave a lookup running behind the caller's back
+
+
+def _fetch_quote_meta(ticker: str) -> tuple[dict, str | None, float | None]:
+    """Return (Ticker.info, fx_pair, fx_rate_to_sek) for ticker (best effort)."""
+    info = _get_info(ticker)
+    fx_pair, fx_rate = _try_fx_rate(_try_currency(info) or "UNKNOWN")
+    return info, fx_pair, fx_rate
+
+
+def _fetch_live_quote(ticker: str, meta: Future) -> Quote:
+    """Build a Quote from yfinance; meta resolves to _fetch_quote_meta()."""
     try:
         yf_ticker = yf.Ticker(ticker)
 
-        price = _try_fast_info_price(yf_ticker)
+        # fast_info only returns (rather than raises) once Yahoo has answered
+        # with the ticker's metadata, so a None from it is a real "no price".
+        fast_info_failed = False
+        try:
+            price = _try_fast_info_price(yf_ticker)
+        except Exception:
+            logger.debug("fast_info lookup failed for %s", ticker, exc_info=True)
+            price, fast_info_failed = None, True
         if price is None:
             price = _try_history_price(yf_ticker)
 
+        info, fx_pair, fx_rate = meta.result()
+        market_state = None
+        if not _skip_market_check():
+            # Runs on worker threads: callers print the user-facing warning
+            market_state = get_market_state(ticker, info)
+            if market_state != "REGULAR":
+                logger.info(
+                    "Market likely closed for ticker: %s (marketState: %s)",
+                    ticker,
+                    market_state,
+                )
+
         if price is None:
+            # An empty history is also what yfinance returns when the request
+            # failed, so only remember tickers Yahoo actually answered for.
+            if not fast_info_failed:
+                _remember_not_found(ticker)
             raise QuoteFetchError(
                 f"Ticker '{ticker}' not found or has no price data.",
                 code=FetchErrorCode.NOT_FOUND,
             )
 
-        company_name = _try_company_name(yf_ticker)
-        currency = _try_currency(yf_ticker) or "UNKNOWN"
+        company_name = _try_company_name(ticker, info)
+        currency = _try_currency(info) or "UNKNOWN"
 
         ts = datetime.now(timezone.utc)
 
         # Best-effort SEK conversion
-        price_sek, fx_pair, fx_rate = _try_convert_to_sek(
-            price=float(price), currency=currency
-        )
+        price_sek = float(price) * fx_rate if fx_rate is not None else None
 
-        return Quote(
+        quote = Quote(
             ticker=ticker,
             price=float(price),
             currency=currency,
@@ -135,7 +433,10 @@ def fetch_latest_quote(ticker: str) -> Quote:
             price_sek=price_sek,
             fx_pair=fx_pair,
             fx_rate_to_sek=fx_rate,
+            market_state=market_state,
         )
+        _store_cached_quote(quote)
+        return quote
 
     except QuoteFetchError:
         raise
@@ -150,7 +451,7 @@ def fetch_latest_quote(ticker: str) -> Quote:
         # Try fallback if we have mock enabled or want to use it in case of network errors
         logger.warning("Network error...falling back to mock for %s", ticker)
         try:
-            return _quote_from_mock(ticker)
+            return _quote_from_mock_unchecked(ticker)
         except QuoteFetchError:
             # If mock cannot be used: throw correct network error
             raise QuoteFetchError(
@@ -159,121 +460,254 @@ def fetch_latest_quote(ticker: str) -> Quote:
             ) from exc
 
 
-def _try_currency(yf_ticker: yf.Ticker) -> Optional[str]:
+# Symbols per yf.download() call; Yahoo's quote endpoints handle ~20 at a
+# time, and one bad chunk then only costs its own symbols the batch price.
+PRICE_BATCH_SIZE = 20
+
+
+def fetch_latest_prices(tickers: Iterable[str]) -> dict[str, float]:
+    """
+    Fetch the latest price for several tickers in batched yfinance requests
+    (PRICE_BATCH_SIZE symbols per request).
+
+    Uses daily bars over a few days so weekends/holidays still return the last
+    close. Tickers missing from the response are left out of the result, so
+    callers can fall back to fetch_latest_quote() per ticker. Never raises.
+    """
+    unique: dict[str, None] = {}
+    for raw in tickers:
+        try:
+            unique[_validate_ticker(raw)] = None
+        except QuoteFetchError:
+            continue
+    symbols = list(unique)
+
+    prices: dict[str, float] = {}
+    for start in range(0, len(symbols), PRICE_BATCH_SIZE):
+        chunk = symbols[start : start + PRICE_BATCH_SIZE]
+        try:
+            frame = yf.download(
+                chunk,
+                period="5d",
+                interval="1d",
+                group_by="ticker",
+                threads=True,
+                progress=False,
+            )
+        except Exception:
+            logger.warning("Batch price download failed for %s", chunk, exc_info=True)
+            continue
+        prices.update(_last_closes(frame, chunk))
+
+    return prices
+
+
+def fetch_quotes_concurrently(
+    tickers: Iterable[str],
+    *,
+    fetch: Callable[[str], Quote] | None = None,
+    executor: Executor | None = None,
+    timeout: float = 20.0,
+) -> dict[str, Quote]:
     """
-    Try to get the instrument currency (e.g. USD, SEK).
+    Fetch quotes one ticker at a time, but in parallel: wall time is roughly
+    the slowest lookup instead of the sum of all of them.
+
+    Args:
+        tickers: Symbols to quote.
+        fetch: Single-ticker quote function (default fetch_latest_quote).
+        executor: Pool to run on; a temporary one (<= 16 threads) otherwise.
+        timeout: Upper bound in seconds for the whole batch. Tickers that fail
+            or are still running when it expires are logged and left out.
     """
+    fetch = fetch or fetch_latest_quote
+    symbols = list(dict.fromkeys(tickers))
+    if not symbols:
+        return {}
+
+    pool = executor or ThreadPoolExecutor(
+        max_workers=min(16, len(symbols)), thread_name_prefix="price"
+    )
     try:
-        info = None
-        if hasattr(yf_ticker, "get_info"):
-            info = yf_ticker.get_info()
-        else:
-            info = getattr(yf_ticker, "info", None)
+        futures = {pool.submit(fetch, symbol): symbol for symbol in symbols}
+        done, not_done = wait(futures, timeout=timeout)
+
+        for future in done:
+            exc = future.exception()
+            if exc is not None:
+                logger.warning("Price fetch failed for %s: %s", futures[future], exc)
+        quotes = {
+            futures[future]: future.result()
+            for future in done
+            if future.exception() is None
+        }
+        for future in not_done:
+            future.cancel()
+            logger.warning("Price fetch timed out for %s", futures[future])
+        return quotes
+    finally:
+        if executor is None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_prices_concurrently(
+    tickers: Iterable[str],
+    *,
+    fetch: Callable[[str], Quote] | None = None,
+    executor: Executor | None = None,
+    timeout: float = 20.0,
+) -> dict[str, float]:
+    """
+    Fetch prices one ticker at a time, but in parallel, for the cases a batch
+    download cannot cover (e.g. fallback for symbols it missed).
 
-        if not isinstance(info, dict):
-            return None
+    Same arguments as fetch_quotes_concurrently(); returns {ticker: price}.
+    """
+    quotes = fetch_quotes_concurrently(
+        tickers, fetch=fetch, executor=executor, timeout=timeout
+    )
+    return {symbol: float(quote.price) for symbol, quote in quotes.items()}
 
-        ccy = info.get("currency")
-        if isinstance(ccy, str):
-            ccy = ccy.strip().upper()
-            return ccy or None
-        return None
-    except Exception:
-        return None
 
+def _last_closes(frame, symbols: list[str]) -> dict[str, float]:
+    """
+    Extract the last non-NaN Close per ticker from a yf.download() frame.
+    """
+    prices: dict[str, float] = {}
+    if frame is None or getattr(frame, "empty", True):
+        return prices
+
+    multi = getattr(frame.columns, "nlevels", 1) > 1
+    if not multi and len(symbols) != 1:
+        return prices
 
-def _try_convert_to_sek(
-    price: float, currency: str
-) -> tuple[Optional[float], Optional[str], Optional[float]]:
+    for symbol in symbols:
+        try:
+            closes = frame[symbol]["Close"] if multi else frame["Close"]
+        except KeyError:
+            continue
+
+        closes = closes.dropna()
+        if not closes.empty:
+            prices[symbol] = float(closes.iloc[-1])
+
+    return prices
+
+
+def _try_currency(info: dict) -> str | None:
     """
-    Convert a price in <currency> to SEK using Yahoo FX tickers (best effort).
+    Try to get the instrument currency (e.g. USD, SEK) from Ticker.info.
+    """
+    ccy = info.get("currency")
+    if isinstance(ccy, str):
+        ccy = ccy.strip().upper()
+        return ccy or None
+    return None
+
+
+def _try_fx_rate(currency: str) -> tuple[str | None, float | None]:
+    """
+    Look up the <currency>SEK rate using Yahoo FX tickers (best effort).
+
+    Returns (fx_pair, rate); rate is None when it could not be fetched and
+    both are None for an unknown currency. Rates are reused for
+    FX_TTL_SECONDS, so a portfolio of N USD stocks does one USDSEK lookup.
     """
     ccy = (currency or "").strip().upper()
     if not ccy or ccy == "UNKNOWN":
-        return None, None, None
+        return None, None
 
     if ccy == "SEK":
-        return float(price), "SEK", 1.0
+        return "SEK", 1.0
 
     fx_pair = f"{ccy}SEK=X"  # e.g. USDSEK=X, EURSEK=X
+    now = time.monotonic()
+    with _fx_lock:
+        entry = _fx_cache.get(fx_pair)
+    if entry is not None and now - entry[0] < FX_TTL_SECONDS:
+        return fx_pair, entry[1]
+
     try:
         fx_ticker = yf.Ticker(fx_pair)
 
         fx_rate = _try_fast_info_price(fx_ticker)
         if fx_rate is None:
             fx_rate = _try_history_price(fx_ticker)
-
-        if fx_rate is None:
-            return None, fx_pair, None
-
-        price_sek = float(price) * float(fx_rate)
-        return price_sek, fx_pair, float(fx_rate)
     except Exception:
-        return None, fx_pair, None
+        return fx_pair, None
+
+    if fx_rate is None:
+        return fx_pair, None
+    with _fx_lock:
+        _fx_cache[fx_pair] = (now, float(fx_rate))
+    return fx_pair, float(fx_rate)
 
 
-def _try_company_name(yf_ticker: yf.Ticker) -> Optional[str]:
+def _try_company_name(symbol: str, info: dict) -> str | None:
     """
-    Try to resolve a human-friendly company name for the ticker.
+    Try to resolve a human-friendly company name from Ticker.info.
+    Resolved names are cached per symbol (they practically never change).
     """
-    try:
-        info = None
-
-        # Some yfinance versions provide get_info(); otherwise .info is common.
-        if hasattr(yf_ticker, "get_info"):
-            info = yf_ticker.get_info()
-        else:
-            info = getattr(yf_ticker, "info", None)
-
-        if not isinstance(info, dict):
-            return None
+    if symbol in _company_names:
+        return _company_names[symbol]
 
-        name = info.get("shortName") or info.get("longName") or info.get("displayName")
-        if isinstance(name, str):
-            name = name.strip()
-            return name or None
-        return None
-    except Exception:
-        return None
+    name = info.get("shortName") or info.get("longName") or info.get("displayName")
+    if isinstance(name, str):
+        name = name.strip()
+        if name:
+            _company_names[symbol] = name
+        return name or None
+    return None
 
 
 def _try_fast_info_price(yf_ticker: yf.Ticker) -> Optional[float]:
     """
     Try to read a last price from yfinance fast_info.
+
+    Returns None when yfinance answered without a price; failed lookups
+    raise, so callers can tell them apart from a confirmed "no price".
     """
     try:
         fast_info = getattr(yf_ticker, "fast_info", None)
-        if not fast_info:
+        if fast_info is None:
             return None
-        price = fast_info.get("last_price")
+        # FastInfo.get() re-validates the key against keys() on every call;
+        # the property goes straight to the (lazily loaded) value.
+        if isinstance(fast_info, dict):
+            price = fast_info.get("last_price")
+        else:
+            price = fast_info.last_price
         return float(price) if price is not None else None
-    except Exception:
+    except YFTickerMissingError:
         return None
 
 
 def _try_history_price(yf_ticker: yf.Ticker) -> Optional[float]:
     """
     Fallback: derive a price from recent history close values.
+
+    One request for daily bars: the current day's bar tracks the live price,
+    and 5 days still cover weekends/holidays (a handful of rows, unlike ~390
+    one-minute bars). auto_adjust=False skips the adjustment pass.
+
+    Returns None when there is no price data. By default yfinance logs a
+    failed request and returns an empty frame, so None alone does not prove
+    the ticker is unknown (see _fetch_live_quote).
     """
     try:
-        hist = yf_ticker.history(period="1d", interval="1m")
-        if hist is not None and not hist.empty:
-            closes = hist.get("Close")
-            if closes is not None:
-                closes = closes.dropna()
-                if not closes.empty:
-                    return float(closes.iloc[-1])
-
-        hist = yf_ticker.history(period="5d", interval="1d")
-        if hist is not None and not hist.empty:
-            closes = hist.get("Close")
-            if closes is not None:
-                closes = closes.dropna()
-                if not closes.empty:
-                    return float(closes.iloc[-1])
-
-        return None
-    except Exception:
+        hist = yf_ticker.history(
+            period="5d", interval="1d", prepost=False, auto_adjust=False
+        )
+        if hist is None or hist.empty:
+            return None
+        closes = hist.get("Close")
+        if closes is None:
+            return None
+        closes = closes.dropna()
+        if closes.empty:
+            return None
+        return float(closes.iloc[-1])
+    except YFTickerMissingError:
         return None
 
 
@@ -286,29 +720,54 @@ def load_mock_prices(path: Path) -> dict:
         raise FileNotFoundError(f"Mock prices file not found: {path}")
 
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        return json_utils.loads(path.read_bytes())
+    except json_utils.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON in mock prices file {path}: {e}")
     except Exception as e:
         raise RuntimeError(f"Failed to load mock prices from {path}: {e}")
 
 
+# Parsed mock prices per path, keyed by the file's (mtime_ns, size).
+_mock_cache: dict[Path, tuple[int, int, dict]] = {}
+
+
+def _load_mock_data(path: Path) -> dict:
+    """
+    Return the parsed mock prices file, re-reading it only when it changed.
+    The returned dict is shared; callers must not mutate it.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _mock_cache.pop(path, None)
+        raise QuoteFetchError(
+            f"Mock prices file not found: {path}",
+            code=FetchErrorCode.NOT_FOUND,
+        )
+
+    cached = _mock_cache.get(path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+
+    mock_data = json_utils.loads(path.read_bytes())
+    _mock_cache[path] = (st.st_mtime_ns, st.st_size, mock_data)
+    return mock_data
+
+
 def _quote_from_mock(ticker: str) -> Quote:
     """
     Fetch a quote from mock data file.
     """
-    ticker = _validate_ticker(ticker)
+    return _quote_from_mock_unchecked(_validate_ticker(ticker))
 
-    try:
-        if not MOCK_PRICES_FILE.exists():
-            raise QuoteFetchError(
-                f"Mock prices file not found: {MOCK_PRICES_FILE}",
-                code=FetchErrorCode.NOT_FOUND,
-            )
 
-        with open(MOCK_PRICES_FILE, "r") as f:
-            mock_data = json.load(f)
+def _quote_from_mock_unchecked(ticker: str) -> Quote:
+    """
+    _quote_from_mock() for a ticker that is already validated/normalized
+    (the fetch_latest_quote fallback path).
+    """
+    try:
+        mock_data = _load_mock_data(MOCK_PRICES_FILE)
 
         if ticker not in mock_data:
             raise QuoteFetchError(
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, Optional
 
 from src.portfolio import Portfolio
 
+if TYPE_CHECKING:  # data_fetcher pulls in yfinance, keep it off the import path
+    from src.data_fetcher import Quote
+
 log = logging.getLogger(__name__)
 
+QUOTE_TIME_FORMAT = "%Y-%m-%d %H:%M:%S %Z"
+MARKET_CLOSED_WARNING = (
+    "Warning: Market appears to be closed for this ticker - showing last known price"
+)
+
 
 def format_portfolio_output(portfolio: Portfolio, price_map: Dict[str, float]) -> str:
     """
@@ -32,12 +40,13 @@ def format_portfolio_output(portfolio: Portfolio, price_map: Dict[str, float]) -
 
     # Start total with cash balance
     total = portfolio.cash
+    missing: list[str] = []
 
     # Iterate through holdings and calculate value per ticker
     for ticker, qty in portfolio.holdings.items():
-        # If price is missing, log warning and skip from total calculation
+        # If price is missing, skip from total calculation (warned once below)
         if ticker not in price_map:
-            log.warning("Price unavailable for %s", ticker)
+            missing.append(ticker)
             lines.append(f"- {ticker} qty={qty}  price unavailable")
             continue
 
@@ -46,6 +55,58 @@ def format_portfolio_output(portfolio: Portfolio, price_map: Dict[str, float]) -
         total += value
         lines.append(f"- {ticker}  qty={qty}  price={price:.2f}  value={value:.2f}")
 
+    if missing:
+        log.warning("Price unavailable for %s", ", ".join(missing))
+
     lines.append("")
     lines.append(f"Total value: {total:.2f}")
     return "\n".join(lines)
+
+
+def format_quote_line(quote: Quote, ticker: Optional[str] = None) -> str:
+    """
+    Format a Quote as the single line shown by the quote commands.
+
+    Args:
+        quote: Quote returned by fetch_latest_quote.
+        ticker: Symbol to display (defaults to quote.ticker).
+
+    Returns:
+        "<TICKER> (<name>) <price> <ccy> | <price> SEK (Fetched at: ...)" with
+        an FX suffix when the conversion rate is known.
+    """
+    ticker = ticker or quote.ticker
+    currency = quote.currency or "UNKNOWN"
+    price_native = f"{quote.price:.2f}"
+
+    # astimezone() per call: a tzinfo cached at import is a fixed offset and
+    # would show wrong local times after a DST switch in the sim loop.
+    ts_str = quote.timestamp.astimezone().strftime(QUOTE_TIME_FORMAT)
+
+    name_part = f" ({quote.company_name})" if quote.company_name else ""
+
+    if quote.price_sek is None:
+        return (
+            f"{ticker}{name_part} {price_native} {currency} | SEK: N/A "
+            f"(Fetched at: {ts_str})"
+        )
+
+    fx_pair, fx_rate = quote.fx_pair, quote.fx_rate_to_sek
+    fx_part = f" (FX: {fx_pair} {float(fx_rate):.4f})" if fx_pair and fx_rate else ""
+    return (
+        f"{ticker}{name_part} {price_native} {currency} | "
+        f"{float(quote.price_sek):.2f} SEK (Fetched at: {ts_str}){fx_part}"
+    )
+
+
+def format_market_warning(quote: Quote) -> str | None:
+    """
+    Return the market-closed warning for a quote, or None.
+
+    Quotes fetched with the market check skipped (or quote-like objects
+    without a market_state) never warn.
+    """
+    state = getattr(quote, "market_state", None)
+    if state is None or state == "REGULAR":
+        return None
+    return MARKET_CLOSED_WARNING
@@ -0,0 +1,73 @@
+# src/json_utils.py
+
+"""
+Fast JSON encode/decode helpers.
+
+Uses orjson when installed (several times faster than the stdlib on large
+float arrays, native NumPy support) and falls back to the stdlib json module
+otherwise, so callers never need to care which backend is active.
+
+dumps() always returns bytes (UTF-8), loads() accepts bytes or str.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+JSONDecodeError = json.JSONDecodeError  # orjson.JSONDecodeError subclasses it
+
+
+def _stdlib_default(default: Callable[[Any], Any] | None) -> Callable[[Any], Any]:
+    """Wrap default so NumPy scalars/arrays also encode without orjson."""
+
+    def _default(obj: Any) -> Any:
+        if hasattr(obj, "tolist"):
+            return obj.tolist()
+        if default is not None:
+            return default(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    return _default
+
+
+def dumps(
+    obj: Any,
+    *,
+    default: Callable[[Any], Any] | None = None,
+    indent: bool = False,
+) -> bytes:
+    """
+    Serialize obj to compact JSON bytes.
+
+    Args:
+        obj: Value to encode (NumPy arrays/scalars are supported).
+        default: Fallback for types neither backend knows natively.
+        indent: Pretty-print with 2-space indentation.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+
+    return json.dumps(
+        obj,
+        default=_stdlib_default(default),
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    ).encode("utf-8")
+
+
+def loads(data: bytes | bytearray | str) -> Any:
+    """Parse JSON from bytes or str (raises JSONDecodeError on bad input)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
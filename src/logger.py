@@ -33,6 +33,13 @@ LOG_FILE_ENV = "LOG_FILE"
 DEFAULT_LOG_FILE = "logs/app.log"
 _DISABLED_LOG_VALUES = {"", "0", "false", "off", "none", "null"}
 
+# Built once: every handler shares the same formatter.
+_FORMATTER = logging.Formatter(fmt=DEFAULT_LOG_FORMAT, datefmt=DEFAULT_DATE_FORMAT)
+
+# Open file handlers by (absolute path, max_bytes, backup_count), so calling
+# init_logging again (e.g. to change the level) keeps the same file handle.
+_file_handlers: dict[tuple[str, int, int], RotatingFileHandler] = {}
+
 
 def _normalize_level(level: str) -> str:
     """Return a valid logging level name; fall back to INFO if invalid."""
@@ -53,6 +60,7 @@ def init_logging(
 
     Behavior:
     - No duplicate handlers (reconfigures cleanly on every call)
+    - An open file handler for the same file/rotation settings is reused
     - During pytest (STOCKSIM_TESTING=1): console is disabled by default
     - During pytest: default file logging (logs/app.log) is disabled
     - LOG_FILE env can override the default log file; LOG_FILE="" disables it
@@ -87,32 +95,43 @@ def init_logging(
             elif v:
                 log_file = v
 
+    file_handler: Optional[RotatingFileHandler] = None
+    if log_file:
+        log_path = Path(log_file)
+        key = (os.path.abspath(log_path), max_bytes, backup_count)
+        file_handler = _file_handlers.get(key)
+        stream = getattr(file_handler, "stream", None)
+        if stream is None or stream.closed or not log_path.exists():
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = RotatingFileHandler(
+                filename=log_path,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+                encoding="utf-8",
+            )
+            file_handler.setFormatter(_FORMATTER)
+            _file_handlers[key] = file_handler
+
     # Always reset handlers to avoid stale/closed streams and duplicates
+    # (the file handler being reused stays open)
     for h in list(root.handlers):
         root.removeHandler(h)
+        if h is file_handler:
+            continue
         try:
             h.close()
         except Exception:
             pass
-
-    formatter = logging.Formatter(fmt=DEFAULT_LOG_FORMAT, datefmt=DEFAULT_DATE_FORMAT)
+        for k, cached in list(_file_handlers.items()):
+            if cached is h:
+                del _file_handlers[k]
 
     if console:
         stream_handler = logging.StreamHandler(stream=sys.stderr)
-        stream_handler.setFormatter(formatter)
+        stream_handler.setFormatter(_FORMATTER)
         root.addHandler(stream_handler)
 
-    if log_file:
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-
-        file_handler = RotatingFileHandler(
-            filename=log_path,
-            maxBytes=max_bytes,
-            backupCount=backup_count,
-            encoding="utf-8",
-        )
-        file_handler.setFormatter(formatter)
+    if file_handler is not None:
         root.addHandler(file_handler)
 
     root.propagate = False
@@ -12,12 +12,26 @@ from __future__ import annotations
 
 import sys
 import shlex
-from dataclasses import dataclass
-from typing import Callable
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
 
 from src.logger import init_logging_from_env, get_logger
 from src.errors import ValidationError, FileError
-from src.data_fetcher import fetch_latest_quote, QuoteFetchError, FetchErrorCode
+from src.data_fetcher import (
+    fetch_latest_quote,
+    fetch_latest_prices,
+    fetch_prices_concurrently,
+    fetch_quotes_concurrently,
+    Quote,
+    QuoteFetchError,
+    FetchErrorCode,
+)
+from src.formatters import (
+    format_market_warning,
+    format_portfolio_output,
+    format_quote_line,
+)
 from src.portfolio import Portfolio
 from src.cli import load_portfolio, save_portfolio, validate_ticker
 from src.snapshot_store import SnapshotStore
@@ -27,40 +41,77 @@ from src.reporting import generate_and_write_report
 
 log = get_logger(__name__)
 
+# How long display commands (quote, report) reuse a quote from this session
+SIM_QUOTE_TTL_SECONDS = 2.0
+
 SIM_COMMANDS: list[tuple[str, str]] = [
     ("quote <TICKER>", "Show latest price for a ticker"),
     ("buy <TICKER> <QTY>", "Buy shares into your portfolio"),
     ("sell <TICKER> <QTY>", "Sell shares from your portfolio"),
     ("portfolio", "Show cash and holdings"),
+    ("portfolio value", "Value holdings at latest prices"),
+    ("refresh", "Quote all holdings (fetched in parallel)"),
     ("report [N]", "Write a daily trade report to data/ (default N=5)"),
     ("help | ?", "Show available commands"),
     ("exit | quit", "Return to the main menu"),
 ]
 
 
+# Static menu/help texts, built once so each is a single stdout write.
+_SIM_HELP = (
+    "\n--- Commands ---\n"
+    + "".join(f"{usage:<22} {desc}\n" for usage, desc in SIM_COMMANDS)
+    + "----------------\n\n"
+)
+
+_MENU_HELP = (
+    "\n--- Help Menu ---\n"
+    "1. In the Main Menu, choose 'Start' to enter the simulation.\n"
+    "2. Inside the simulation, use commands like: quote, sell, portfolio.\n"
+    "3. Type 'exit' or 'quit' to return to the menu.\n"
+    "---------------------\n"
+)
+
+_MAIN_MENU = (
+    "\n===============================\n"
+    "   Welcome to TradeSim         \n"
+    "===============================\n"
+    "1. Start Simulation\n"
+    "2. Help\n"
+    "3. Exit\n"
+    "===============================\n"
+)
+
+_SIM_BANNER = (
+    "\n--- Stock Simulator ---\n"
+    "Type 'help' or '?' for commands. Type 'exit' or 'quit' to return to the main menu.\n"
+    "\n"
+)
+
+
 def print_sim_help() -> None:
     """Print available simulation commands."""
-    print("\n--- Commands ---")
-    for usage, desc in SIM_COMMANDS:
-        print(f"{usage:<22} {desc}")
-    print("----------------\n")
+    sys.stdout.write(_SIM_HELP)
 
 
 def print_menu_help() -> None:
     """Print the main menu help text."""
-    print("\n--- Help Menu ---")
-    print("1. In the Main Menu, choose 'Start' to enter the simulation.")
-    print("2. Inside the simulation, use commands like: quote, sell, portfolio.")
-    print("3. Type 'exit' or 'quit' to return to the menu.")
-    print("---------------------")
+    sys.stdout.write(_MENU_HELP)
     input("\nPress Enter to return to the main menu...")
 
 
+def _fetch_fresh_quote(ticker: str) -> Quote:
+    """Quote for trades: bypasses the persisted quote cache."""
+    return fetch_latest_quote(ticker, use_cache=False)
+
+
 @dataclass
 class SimDeps:
     """Dependencies for the simulation dispatch (helps unit testing)."""
 
-    fetch_quote: Callable = fetch_latest_quote
+    fetch_quote: Callable = fetch_latest_quote  # display (quote/refresh/report)
+    fetch_trade_quote: Callable = _fetch_fresh_quote  # buy/sell fill price
+    fetch_prices: Callable = fetch_latest_prices  # batch: tickers -> {ticker: price}
     load_pf: Callable = load_portfolio
     save_pf: Callable = save_portfolio
 
@@ -70,174 +121,268 @@ class SimState:
     """Runtime state for the simulation loop."""
 
     portfolio: Portfolio
+    tm: TransactionManager | None = None  # built once per session
+    snapshot_store: SnapshotStore | None = None
+    # ticker -> (monotonic fetch time, quote), see _get_quote_cached
+    quote_cache: dict[str, tuple[float, Quote]] = field(default_factory=dict)
+    # True while a trade is not yet on disk (its save failed); exit retries it
+    unsaved: bool = False
+
+
+def _get_quote_cached(state: SimState, deps: SimDeps, ticker: str) -> Quote:
+    """
+    Return a quote for display, reusing one fetched in the last
+    SIM_QUOTE_TTL_SECONDS (e.g. 'quote AAPL' twice). Trades never use it.
+    """
+    now = time.monotonic()
+    entry = state.quote_cache.get(ticker)
+    if entry is not None and now - entry[0] < SIM_QUOTE_TTL_SECONDS:
+        return entry[1]
+
+    quote = deps.fetch_quote(ticker)
+    state.quote_cache[ticker] = (now, quote)
+    return quote
+
+
+def _deps_price_provider(state: SimState, deps: SimDeps) -> Callable[[str], float]:
+    """Display price provider (reports) backed by the session quote cache."""
+
+    def _get_price(ticker: str) -> float:
+        return float(_get_quote_cached(state, deps, ticker).price)
+
+    return _get_price
+
+
+def _trade_price_provider(deps: SimDeps) -> Callable[[str], float]:
+    """Price provider for TransactionManager: always a fresh quote."""
+
+    def _get_price(ticker: str) -> float:
+        return float(deps.fetch_trade_quote(ticker).price)
+
+    return _get_price
+
+
+def _transaction_manager(state: SimState, deps: SimDeps) -> TransactionManager:
+    """
+    Return the session TransactionManager, building it on first use.
+
+    The manager is rebuilt only if state.portfolio was replaced, since it
+    trades against the Portfolio object it was created with.
+    """
+    tm = state.tm
+    if tm is None or tm.portfolio is not state.portfolio:
+        if state.snapshot_store is None:
+            state.snapshot_store = SnapshotStore()
+        tm = state.tm = TransactionManager(
+            portfolio=state.portfolio,
+            price_provider=_trade_price_provider(deps),
+            snapshot_store=state.snapshot_store,
+            logger=log,
+        )
+    return tm
 
 
 def _print_quote(ticker: str, quote) -> None:
     """Print a quote in a user-friendly format."""
-    currency = getattr(quote, "currency", "UNKNOWN")
-    price_native = f"{quote.price:.2f}"
+    warning = format_market_warning(quote)
+    if warning:
+        print(warning)
+    print(format_quote_line(quote, ticker))
 
-    local_ts = quote.timestamp.astimezone()
-    ts_str = local_ts.strftime("%Y-%m-%d %H:%M:%S %Z")
 
-    name_part = (
-        f" ({quote.company_name})" if getattr(quote, "company_name", None) else ""
+def _print_portfolio_value(portfolio: Portfolio, deps: SimDeps) -> None:
+    """
+    Price all holdings with one batched request (per-ticker quotes in
+    parallel only for symbols the batch missed) and print their value.
+    """
+    holdings = list(portfolio.holdings)
+    prices = deps.fetch_prices(holdings) if holdings else {}
+    missing = [t for t in holdings if t not in prices]
+    if missing:
+        prices = {
+            **prices,
+            **fetch_prices_concurrently(missing, fetch=deps.fetch_quote),
+        }
+
+    print("\n--- Portfolio value ---")
+    print(format_portfolio_output(portfolio, prices))
+    print("-----------------------\n")
+
+
+def _print_holding_quotes(portfolio: Portfolio, deps: SimDeps) -> None:
+    """Quote every holding concurrently and print one line per ticker."""
+    holdings = list(portfolio.holdings)
+    if not holdings:
+        print("No holdings to refresh.")
+        return
+
+    quotes = fetch_quotes_concurrently(holdings, fetch=deps.fetch_quote)
+    # One write for the whole block instead of a print() per holding
+    sys.stdout.write(
+        "".join(
+            f"{format_quote_line(quotes[t], t)}\n"
+            if t in quotes
+            else f"{t}: quote unavailable\n"
+            for t in holdings
+        )
     )
 
-    price_sek_val = getattr(quote, "price_sek", None)
-    if price_sek_val is not None:
-        price_sek = f"{float(price_sek_val):.2f}"
-        fx_pair = getattr(quote, "fx_pair", None)
-        fx_rate = getattr(quote, "fx_rate_to_sek", None)
-        fx_part = (
-            f" (FX: {fx_pair} {float(fx_rate):.4f})" if fx_pair and fx_rate else ""
-        )
-        print(
-            f"{ticker}{name_part} {price_native} {currency} | {price_sek} SEK (Fetched at: {ts_str}){fx_part}"
-        )
-    else:
-        print(
-            f"{ticker}{name_part} {price_native} {currency} | SEK: N/A (Fetched at: {ts_str})"
-        )
 
+def _parse_trade_args(tokens: list[str], verb: str) -> tuple[str, float]:
+    """Validate '<verb> <TICKER> <QTY>' and return (ticker, qty)."""
+    if len(tokens) != 3:
+        raise ValidationError(f"Usage: {verb} <TICKER> <QTY>")
+    ticker = validate_ticker(tokens[1])
 
-def dispatch_line(line: str, state: SimState, deps: SimDeps) -> bool:
-    """
-    Dispatch a single simulation command.
+    try:
+        qty = float(tokens[2])
+    except ValueError as exc:
+        raise ValidationError("Quantity must be a number.") from exc
 
-    Returns:
-        True to continue, False to exit simulation to main menu.
+    if qty <= 0:
+        raise ValidationError("Quantity must be greater than 0.")
+    return ticker, qty
 
-    Raises:
-        ValidationError: invalid user input.
-        FileError: portfolio load/save failed.
-        QuoteFetchError: market data fetch failed.
-        Exception: unexpected errors.
-    """
 
-    def _deps_price_provider(deps: SimDeps):
-        def _get_price(ticker: str) -> float:
-            quote = deps.fetch_quote(ticker)
-            return float(quote.price)
+def _save_after_trade(state: SimState, deps: SimDeps) -> None:
+    """Persist the portfolio after a trade; a failed save leaves it unsaved."""
+    state.unsaved = True
+    deps.save_pf(state.portfolio)
+    state.unsaved = False
 
-        return _get_price
 
-    tokens = shlex.split(line)
-    if not tokens:
-        return True
+def _handle_exit(tokens: list[str], state: SimState, deps: SimDeps) -> bool:
+    return False
 
-    cmd = tokens[0].lower()
 
-    if cmd in {"exit", "quit"}:
-        return False
+def _handle_help(tokens: list[str], state: SimState, deps: SimDeps) -> bool:
+    print_sim_help()
+    return True
 
-    if cmd in {"help", "?"}:
-        print_sim_help()
-        return True
 
-    if cmd == "portfolio":
-        pf = state.portfolio
-        print("\n--- Portfolio ---")
-        print(f"Cash: {pf.cash:.2f}")
-        if not pf.holdings:
-            print("Holdings: (empty)")
-        else:
-            print("Holdings:")
-            for t, qty in pf.holdings.items():
-                print(f"  {t}: {qty}")
-        print("-----------------\n")
-        return True
+def _handle_refresh(tokens: list[str], state: SimState, deps: SimDeps) -> bool:
+    _print_holding_quotes(state.portfolio, deps)
+    return True
+
 
-    if cmd == "quote":
-        if len(tokens) != 2:
-            raise ValidationError("Usage: quote <TICKER>")
-        ticker = validate_ticker(tokens[1])
-        quote = deps.fetch_quote(ticker)
-        _print_quote(ticker, quote)
+def _handle_portfolio(tokens: list[str], state: SimState, deps: SimDeps) -> bool:
+    if len(tokens) == 2 and tokens[1].lower() == "value":
+        _print_portfolio_value(state.portfolio, deps)
         return True
 
-    if cmd == "buy":
-        if len(tokens) != 3:
-            raise ValidationError("Usage: buy <TICKER> <QTY>")
-        ticker = validate_ticker(tokens[1])
+    pf = state.portfolio
+    print("\n--- Portfolio ---")
+    print(f"Cash: {pf.cash:.2f}")
+    if not pf.holdings:
+        print("Holdings: (empty)")
+    else:
+        print("Holdings:")
+        for t, qty in pf.holdings.items():
+            print(f"  {t}: {qty}")
+    print("-----------------\n")
+    return True
 
-        try:
-            qty = float(tokens[2])
-        except ValueError as exc:
-            raise ValidationError("Quantity must be a number.") from exc
 
-        if qty <= 0:
-            raise ValidationError("Quantity must be greater than 0.")
+def _handle_quote(tokens: list[str], state: SimState, deps: SimDeps) -> bool:
+    if len(tokens) != 2:
+        raise ValidationError("Usage: quote <TICKER>")
+    ticker = validate_ticker(tokens[1])
+    quote = _get_quote_cached(state, deps, ticker)
+    _print_quote(ticker, quote)
+    return True
 
-        tm_local = TransactionManager(
-            portfolio=state.portfolio,
-            price_provider=_deps_price_provider(deps),
-            snapshot_store=SnapshotStore(),
-            logger=log,
-        )
-        tx = tm_local.buy(ticker, qty)
-        deps.save_pf(state.portfolio)
 
-        print(f"SUCCESS: Bought {tx.quantity} shares of {tx.ticker} at {tx.price:.2f}.")
-        print(
-            f"Cost: {tx.gross_amount:.2f}. New Cash Balance: {state.portfolio.cash:.2f}"
-        )
-        return True
+def _handle_buy(tokens: list[str], state: SimState, deps: SimDeps) -> bool:
+    ticker, qty = _parse_trade_args(tokens, "buy")
+
+    tx = _transaction_manager(state, deps).buy(ticker, qty)
+    _save_after_trade(state, deps)
+
+    print(f"SUCCESS: Bought {tx.quantity} shares of {tx.ticker} at {tx.price:.2f}.")
+    print(f"Cost: {tx.gross_amount:.2f}. New Cash Balance: {state.portfolio.cash:.2f}")
+    return True
+
+
+def _handle_sell(tokens: list[str], state: SimState, deps: SimDeps) -> bool:
+    ticker, qty = _parse_trade_args(tokens, "sell")
 
-    if cmd == "sell":
-        if len(tokens) != 3:
-            raise ValidationError("Usage: sell <TICKER> <QTY>")
-        ticker = validate_ticker(tokens[1])
+    tx = _transaction_manager(state, deps).sell(ticker, qty)
+    _save_after_trade(state, deps)
 
+    print(f"SUCCESS: Sold {tx.quantity} shares of {tx.ticker} at {tx.price:.2f}.")
+    print(
+        f"Proceeds: {tx.gross_amount:.2f}. New Cash Balance: {state.portfolio.cash:.2f}"
+    )
+    return True
+
+
+def _handle_report(tokens: list[str], state: SimState, deps: SimDeps) -> bool:
+    if len(tokens) not in {1, 2}:
+        raise ValidationError("Usage: report [N]")
+
+    recent_n = 5
+    if len(tokens) == 2:
         try:
-            qty = float(tokens[2])
+            recent_n = int(tokens[1])
         except ValueError as exc:
-            raise ValidationError("Quantity must be a number.") from exc
+            raise ValidationError("Usage: report [N] (N must be an integer)") from exc
 
-        if qty <= 0:
-            raise ValidationError("Quantity must be greater than 0.")
+        if recent_n < 0:
+            raise ValidationError("N must be >= 0.")
 
-        tm_local = TransactionManager(
-            portfolio=state.portfolio,
-            price_provider=_deps_price_provider(deps),
-            snapshot_store=SnapshotStore(),
-            logger=log,
-        )
-        tx = tm_local.sell(ticker, qty)
-        deps.save_pf(state.portfolio)
+    out_path = generate_and_write_report(
+        portfolio=state.portfolio,
+        price_provider=_deps_price_provider(state, deps),
+        recent_n=recent_n,
+        batch_price_provider=deps.fetch_prices,
+    )
+    print(f"Report written to {out_path}")
+    return True
 
-        print(f"SUCCESS: Sold {tx.quantity} shares of {tx.ticker} at {tx.price:.2f}.")
-        print(
-            f"Proceeds: {tx.gross_amount:.2f}. New Cash Balance: {state.portfolio.cash:.2f}"
-        )
-        return True
 
-    if cmd == "report":
-        if len(tokens) not in {1, 2}:
-            raise ValidationError("Usage: report [N]")
+# Command word -> handler(tokens, state, deps); returns False to leave the loop
+_HANDLERS: dict[str, Callable[[list[str], SimState, SimDeps], bool]] = {
+    "exit": _handle_exit,
+    "quit": _handle_exit,
+    "help": _handle_help,
+    "?": _handle_help,
+    "refresh": _handle_refresh,
+    "portfolio": _handle_portfolio,
+    "quote": _handle_quote,
+    "buy": _handle_buy,
+    "sell": _handle_sell,
+    "report": _handle_report,
+}
 
-        recent_n = 5
-        if len(tokens) == 2:
-            try:
-                recent_n = int(tokens[1])
-            except ValueError as exc:
-                raise ValidationError(
-                    "Usage: report [N] (N must be an integer)"
-                ) from exc
 
-            if recent_n < 0:
-                raise ValidationError("N must be >= 0.")
+def dispatch_line(line: str, state: SimState, deps: SimDeps) -> bool:
+    """
+    Dispatch a single simulation command.
 
-        out_path = generate_and_write_report(
-            portfolio=state.portfolio,
-            price_provider=_deps_price_provider(deps),
-            recent_n=recent_n,
-        )
-        print(f"Report written to {out_path}")
+    Returns:
+        True to continue, False to exit simulation to main menu.
+
+    Raises:
+        ValidationError: invalid user input.
+        FileError: portfolio load/save failed.
+        QuoteFetchError: market data fetch failed.
+        Exception: unexpected errors.
+    """
+
+    # Commands are plain words; only pay for shlex when quoting is present
+    if "'" in line or '"' in line or "\\" in line:
+        tokens = shlex.split(line)
+    else:
+        tokens = line.split()
+    if not tokens:
         return True
 
-    print(f"Unknown command: '{cmd}'. Type 'help' for a list of commands.")
-    return True
+    cmd = tokens[0].lower()
+    handler = _HANDLERS.get(cmd)
+    if handler is None:
+        print(f"Unknown command: '{cmd}'. Type 'help' for a list of commands.")
+        return True
+    return handler(tokens, state, deps)
 
 
 def safe_dispatch(line: str, state: SimState, deps: SimDeps) -> bool:
@@ -285,10 +430,7 @@ def run_simulation() -> None:
     The loop is safe: expected errors do not crash the program, and unexpected
     errors are logged with stacktrace while the loop continues.
     """
-    print("\n--- Stock Simulator ---")
-    print(
-        "Type 'help' or '?' for commands. Type 'exit' or 'quit' to return to the main menu.\n"
-    )
+    sys.stdout.write(_SIM_BANNER)
 
     deps = SimDeps()
 
@@ -300,39 +442,56 @@ def run_simulation() -> None:
         portfolio = Portfolio()
 
     state = SimState(portfolio=portfolio)
+    _transaction_manager(state, deps)
 
-    while True:
-        try:
-            line = input("TradeSim (Active) > ").strip()
-        except (EOFError, KeyboardInterrupt):
-            print("\nReturning to main menu.")
-            return
-
+    for raw in _command_lines():
+        line = raw.strip()
         if line == "":
             continue
 
         keep_running = safe_dispatch(line, state, deps)
         if not keep_running:
             print("Saving data... Returning to main menu.")
-            try:
-                deps.save_pf(state.portfolio)
-            except FileError as exc:
-                log.warning("Portfolio save failed on exit: %s", exc, exc_info=True)
-                print("Warning: Could not save portfolio on exit.")
+            # Successful trades are saved as they happen; retry only failed ones
+            if state.unsaved:
+                try:
+                    deps.save_pf(state.portfolio)
+                except FileError as exc:
+                    log.warning("Portfolio save failed on exit: %s", exc, exc_info=True)
+                    print("Warning: Could not save portfolio on exit.")
+            return
+
+    print("\nReturning to main menu.")
+
+
+def _command_lines() -> Iterator[str]:
+    """
+    Yield simulation commands until EOF or Ctrl+C.
+
+    A terminal gets the interactive prompt; piped/redirected stdin is
+    iterated directly (buffered reads, no prompt per line).
+    """
+    if not sys.stdin.isatty():
+        try:
+            # Not "yield from": closing this generator must not close stdin
+            for line in sys.stdin:  # noqa: UP028
+                yield line
+        except KeyboardInterrupt:
+            pass
+        return
+
+    while True:
+        try:
+            yield input("TradeSim (Active) > ")
+        except (EOFError, KeyboardInterrupt):
             return
 
 
 def main_menu() -> None:
     """Show the main menu and route user actions."""
     while True:
-        print("\n===============================")
-        print("   Welcome to TradeSim         ")
-        print("===============================")
-        print("1. Start Simulation")
-        print("2. Help")
-        print("3. Exit")
-        print("===============================")
-
+        # input() flushes stdout before prompting, so no explicit flush
+        sys.stdout.write(_MAIN_MENU)
         choice = input("Please select an option (1-3): ").strip()
 
         if choice == "1":
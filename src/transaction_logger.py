@@ -1,19 +1,34 @@
 from src.logger import get_logger
-from src.config import TRANSACTIONS_FILE
-from datetime import datetime, timezone
-import json
+from src.config import LEGACY_TRANSACTIONS_FILE, TRANSACTIONS_FILE
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from src import json_utils
 from src.models.transaction import Transaction
+from src.timeutil import utc_timestamp_iso_z
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore
 
 log = get_logger(__name__)
 
+# History targets already checked for a legacy transactions.json to convert
+_migration_checked: set[Path] = set()
+
 
 def log_transaction(tx: Transaction) -> bool:
-    """Logs a completed transaction to the JSON history (append)."""
+    """
+    Logs a completed transaction to the history file.
+
+    The history is JSON Lines: one record per line, appended in a single
+    write, so logging a trade costs the same regardless of history length.
+    """
     record = {
-        "timestamp": (
-            tx.timestamp
-            or datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-        ),
+        "timestamp": tx.timestamp or utc_timestamp_iso_z(),
         "side": tx.kind.upper(),
         "ticker": tx.ticker,
         "quantity": tx.quantity,
@@ -22,25 +37,10 @@ def log_transaction(tx: Transaction) -> bool:
         "cash_after": tx.cash_after,
     }
 
-    # Load history or from scratch if none
-    existing = []
-    if TRANSACTIONS_FILE.is_file():
-        try:
-            with TRANSACTIONS_FILE.open("r", encoding="utf-8") as f:
-                existing = json.load(f)
-        except json.JSONDecodeError:
-            log.warning("transactions.json is corrupt – restarting with empty history")
-            existing = []
-        except OSError as e:
-            log.error("Couldn't read transaction history: %s", e)
-            existing = []
-
-    existing.append(record)
-
     try:
         TRANSACTIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with TRANSACTIONS_FILE.open("w", encoding="utf-8") as f:
-            json.dump(existing, f, indent=2, ensure_ascii=False)
+        migrate_legacy_transactions(TRANSACTIONS_FILE)
+        _append_line(TRANSACTIONS_FILE, json_utils.dumps(record) + b"\n")
 
         log.info(
             "Transaction logged: %s %s qty=%.2f price=%.2f total=%.2f ts=%s cash_after=%.2f",
@@ -60,6 +60,104 @@ def log_transaction(tx: Transaction) -> bool:
         return False
 
 
-def utc_timestamp_iso_z() -> str:
-    """Return current UTC timestamp as ISO 8601 with Z suffix."""
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+def _append_line(path: Path, line: bytes) -> None:
+    """Append one complete line (locked where flock exists)."""
+    with path.open("ab") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        f.write(line)
+
+
+def iter_transaction_records(path: Path) -> Iterator[dict[str, Any]]:
+    """
+    Yield transaction records (dicts) from a history file.
+
+    .jsonl files are streamed line by line; blank or corrupt lines (e.g. a
+    write cut short by a crash) are skipped. Any other suffix is read as the
+    legacy JSON list. Raises OSError / JSONDecodeError for unreadable files.
+    """
+    if path.suffix.lower() != ".jsonl":
+        data = json_utils.loads(path.read_bytes())
+        if not isinstance(data, list):
+            raise ValueError(f"{path.name} must be a list, got {type(data).__name__}")
+        yield from (r for r in data if isinstance(r, dict))
+        return
+
+    with path.open("rb") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json_utils.loads(line)
+            except json_utils.JSONDecodeError:
+                log.warning("Skipping corrupt line %d in %s", lineno, path)
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def read_transaction_records(path: Path) -> list[dict[str, Any]]:
+    """
+    Read every record of a history file at once (for whole-history analytics).
+
+    A clean .jsonl file is parsed in one call by turning its lines into a
+    JSON array; if that fails (corrupt/blank lines) it falls back to the
+    line-by-line reader, which skips bad lines.
+    """
+    if path.suffix.lower() != ".jsonl":
+        return list(iter_transaction_records(path))
+
+    raw = path.read_bytes().strip()
+    if not raw:
+        return []
+    try:
+        data = json_utils.loads(b"[" + raw.replace(b"\n", b",") + b"]")
+    except json_utils.JSONDecodeError:
+        return list(iter_transaction_records(path))
+    return [r for r in data if isinstance(r, dict)]
+
+
+def migrate_legacy_transactions(
+    target: Path = TRANSACTIONS_FILE, legacy: Path | None = None
+) -> int:
+    """
+    One-shot conversion of a legacy transactions.json list into target.
+
+    Runs only while target does not exist yet; the legacy file is renamed to
+    *.migrated afterwards so it is never imported twice.
+
+    Returns:
+        Number of records migrated (0 when there was nothing to do).
+    """
+    if target in _migration_checked:
+        return 0
+    _migration_checked.add(target)
+
+    legacy = legacy or target.with_name(LEGACY_TRANSACTIONS_FILE.name)
+    if target.exists() or not legacy.is_file():
+        return 0
+
+    try:
+        records = list(iter_transaction_records(legacy))
+    except (OSError, ValueError) as e:
+        log.warning("Legacy transaction history %s not migrated: %s", legacy, e)
+        return 0
+
+    tmp_path = f"{target}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(json_utils.dumps(r) + b"\n" for r in records))
+        os.replace(tmp_path, target)
+        legacy.replace(legacy.with_name(legacy.name + ".migrated"))
+    except OSError as e:
+        # e.g. a read-only data dir: leave the legacy file, retry next call
+        log.warning("Legacy transaction history %s not migrated: %s", legacy, e)
+        _migration_checked.discard(target)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return 0
+
+    log.info("Migrated %d transactions from %s to %s", len(records), legacy, target)
+    return len(records)
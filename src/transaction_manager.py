@@ -8,7 +8,8 @@ from src.errors import ValidationError
 from src.logger import get_logger
 from src.portfolio import Portfolio
 from src.snapshot_store import SnapshotStore
-from src.transaction_logger import log_transaction, utc_timestamp_iso_z
+from src.timeutil import utc_timestamp_iso_z
+from src.transaction_logger import log_transaction
 from src.validators import validate_positive_number, validate_ticker
 from src.models.transaction import Transaction
 
@@ -105,19 +106,17 @@ class TransactionManager:
 
         # mutate after all checks => atomic on expected failures
         self.portfolio.cash -= total_cost
-        self.portfolio.holdings[clean_ticker] = (
-            self.portfolio.holdings.get(clean_ticker, 0.0) + qty
-        )
+        new_qty = self.portfolio.holdings.get(clean_ticker, 0.0) + qty
+        self.portfolio.holdings[clean_ticker] = new_qty
 
         if self.snapshot_store:
-            holdings_value = self.portfolio.holdings.get(clean_ticker, 0.0) * price
             self.snapshot_store.append_snapshot(
                 event="BUY",
                 ticker=clean_ticker,
                 quantity=qty,
                 price=price,
                 cash=self.portfolio.cash,
-                holdings_value=holdings_value,
+                holdings_value=new_qty * price,
             )
 
         tx = Transaction(
@@ -167,14 +166,14 @@ class TransactionManager:
             self.portfolio.holdings[clean_ticker] = remaining
 
         if self.snapshot_store:
-            holdings_value = self.portfolio.holdings.get(clean_ticker, 0.0) * price
+            # owned >= qty, so remaining is 0.0 (not negative) when popped
             self.snapshot_store.append_snapshot(
                 event="SELL",
                 ticker=clean_ticker,
                 quantity=qty,
                 price=price,
                 cash=self.portfolio.cash,
-                holdings_value=holdings_value,
+                holdings_value=remaining * price,
             )
 
         tx = Transaction(
@@ -232,7 +231,7 @@ class TransactionManager:
             raise MarketClosedError(msg)
 
     def _default_price_provider(self, ticker: str) -> float:
-        quote = fetch_latest_quote(ticker)
+        quote = fetch_latest_quote(ticker, use_cache=False)  # trade at a fresh price
         return float(quote.price)
 
     def _get_price(self, ticker: str) -> float:
@@ -2,24 +2,31 @@
 Central validation logic for user inputs.
 """
 
+import sys
+from functools import lru_cache
+
 from src.errors import ValidationError
 
 
+@lru_cache(maxsize=4096)
 def normalize_ticker(raw_ticker: str) -> str:
     """
     Cleans up a ticker symbol string.
     Strips whitespace and converts to uppercase.
+    The result is interned so equal tickers share one str object.
     """
     if not raw_ticker:
         return ""
 
-    return raw_ticker.strip().upper()
+    return sys.intern(raw_ticker.strip().upper())
 
 
+@lru_cache(maxsize=4096)
 def validate_ticker(ticker: str) -> str:
     """
     Validates that a ticker is not empty after normalization.
     Returns the clean ticker or raises ValidationError.
+    Memoized: tickers repeat across requests/trades (errors are not cached).
     """
     clean_ticker = normalize_ticker(ticker)
 
@@ -1,5 +1,7 @@
+import json
+
 import pandas as pd
-from src.analytics import compute_pl
+from src.analytics import compute_pl, load_transactions_df
 
 
 def test_compute_pl_returns_zeros_when_no_data():
@@ -47,3 +49,96 @@ def test_compute_pl_average_cost_realized_and_unrealized():
     assert aapl["avg_cost"] == 105.0
     assert aapl["latest_price"] == 115.0
     assert aapl["unrealized_pl"] == 150.0
+
+
+def test_compute_pl_mixes_buy_only_and_selling_tickers():
+    """
+    Buy-only tickers (aggregated) and tickers with sells (sequential)
+    are combined in one result, in first-seen order.
+    """
+    df = pd.DataFrame(
+        [
+            {"ticker": "MSFT", "side": "BUY", "quantity": 2, "price": 300},
+            {"ticker": "AAPL", "side": "SELL", "quantity": 1, "price": 90},
+            {"ticker": "AAPL", "side": "BUY", "quantity": 10, "price": 100},
+            {"ticker": "MSFT", "side": "BUY", "quantity": 2, "price": 310},
+            {"ticker": "AAPL", "side": "SELL", "quantity": 4, "price": 110},
+        ]
+    )
+
+    out = compute_pl(df, latest_prices={"AAPL": 105.0, "MSFT": 320.0})
+
+    # AAPL: first sell is skipped (no holdings), then (110 - 100) * 4 = 40
+    assert out["realized_pl"] == 40.0
+    assert list(out["per_ticker"]) == ["MSFT", "AAPL"]
+    assert out["per_ticker"]["MSFT"] == {
+        "qty": 4.0,
+        "avg_cost": 305.0,
+        "latest_price": 320.0,
+        "unrealized_pl": 60.0,
+    }
+    assert out["per_ticker"]["AAPL"]["qty"] == 6.0
+    assert out["unrealized_pl"] == 60.0 + 30.0
+
+
+def test_compute_pl_batches_missing_prices_with_per_ticker_fallback():
+    """
+    Missing prices are fetched in one batch call; tickers the batch
+    cannot price fall back to the single-ticker fetcher.
+    """
+    df = pd.DataFrame(
+        [
+            {"ticker": "AAPL", "side": "BUY", "quantity": 1, "price": 100},
+            {"ticker": "MSFT", "side": "BUY", "quantity": 1, "price": 200},
+            {"ticker": "VOLV-B.ST", "side": "BUY", "quantity": 1, "price": 300},
+        ]
+    )
+    batches: list[list[str]] = []
+    singles: list[str] = []
+
+    def batch(tickers):
+        batches.append(list(tickers))
+        return {"MSFT": 210.0}
+
+    class _Quote:
+        price = 310.0
+
+    def single(ticker):
+        singles.append(ticker)
+        return _Quote()
+
+    out = compute_pl(
+        df,
+        latest_prices={"AAPL": 110.0},
+        price_fetcher=single,
+        batch_price_fetcher=batch,
+    )
+
+    assert batches == [["MSFT", "VOLV-B.ST"]]
+    assert singles == ["VOLV-B.ST"]
+    assert out["unrealized_pl"] == 30.0
+
+
+def test_load_transactions_df_reads_json_and_csv(tmp_path):
+    """
+    JSON record lists, JSON Lines and CSV files load into the same
+    normalized frame.
+    """
+    records = [
+        {"ticker": "aapl", "kind": "buy", "quantity": 2, "price": 100.5},
+        {"ticker": "AAPL", "kind": "SELL", "quantity": 1, "price": 110},
+    ]
+    json_path = tmp_path / "transactions.json"
+    json_path.write_text(json.dumps(records), encoding="utf-8")
+    csv_path = tmp_path / "transactions.csv"
+    pd.DataFrame(records).to_csv(csv_path, index=False)
+    jsonl_path = tmp_path / "transactions.jsonl"
+    jsonl_path.write_text(
+        "".join(json.dumps(r) + "\n" for r in records), encoding="utf-8"
+    )
+
+    for path in (json_path, jsonl_path, csv_path):
+        df = load_transactions_df(path)
+        assert list(df["ticker"]) == ["AAPL", "AAPL"]
+        assert list(df["side"]) == ["BUY", "SELL"]
+        assert list(df["price"]) == [100.5, 110.0]
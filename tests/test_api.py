@@ -11,6 +11,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+import api_server
 from api_server import app
 from src.portfolio import Portfolio
 from src.cli import save_portfolio
@@ -106,6 +107,100 @@ class TestHistoricalEndpoint:
             assert candle["low"] <= candle["close"]
 
 
+class TestHistoricalOffline:
+    """Historical endpoint with a stubbed yfinance history frame (no network)."""
+
+    @pytest.fixture
+    def fake_history(self, monkeypatch):
+        import pandas as pd
+
+        index = pd.DatetimeIndex(
+            ["2026-02-02 14:30", "2026-02-02 14:31", "2026-02-02 14:32"], tz="UTC"
+        )
+        frame = pd.DataFrame(
+            {
+                "Open": [10.0, None, 11.0],
+                "High": [12.0, 12.0, 13.0],
+                "Low": [9.0, 9.0, 10.0],
+                "Close": [11.0, 11.5, 12.0],
+                "Volume": [100, 200, None],
+            },
+            index=index,
+        )
+
+        class FakeTicker:
+            calls = []
+
+            def __init__(self, symbol, **_kwargs):
+                self.symbol = symbol
+
+            def history(self, **_kwargs):
+                self.calls.append(_kwargs)
+                return frame
+
+        monkeypatch.setattr("yfinance.Ticker", FakeTicker)
+        api_server._get_ticker.cache_clear()
+        api_server._hist_cache.clear()
+        yield frame
+        api_server._get_ticker.cache_clear()
+        api_server._hist_cache.clear()
+
+    def test_skips_invalid_rows_and_converts_types(self, client, fake_history):
+        response = client.get("/api/historical/aapl?period=3mo&interval=1d")
+        assert response.status_code == 200
+
+        data = json.loads(response.data)
+        assert data["ticker"] == "AAPL"
+        assert [c["time"] for c in data["data"]] == [1770042600, 1770042720]
+        assert data["data"][0] == {
+            "time": 1770042600,
+            "open": 10.0,
+            "high": 12.0,
+            "low": 9.0,
+            "close": 11.0,
+            "volume": 100,
+        }
+        assert data["data"][1]["volume"] == 0
+
+    def test_columnar_format_returns_parallel_arrays(self, client, fake_history):
+        response = client.get(
+            "/api/historical/AAPL?period=3mo&interval=1d&format=columnar"
+        )
+        assert response.status_code == 200
+
+        data = json.loads(response.data)
+        assert "data" not in data
+        assert data["time"] == [1770042600, 1770042720]
+        assert data["open"] == [10.0, 11.0]
+        assert data["close"] == [11.0, 12.0]
+        assert data["volume"] == [100, 0]
+
+    def test_repeat_polls_are_served_from_cache(self, client, fake_history):
+        import yfinance
+
+        for _ in range(3):
+            response = client.get("/api/historical/AAPL?period=3mo&interval=1d")
+            assert response.status_code == 200
+
+        assert len(yfinance.Ticker.calls) == 1
+
+    def test_etag_returns_304_when_unchanged(self, client, fake_history):
+        url = "/api/historical/AAPL?period=3mo&interval=1d"
+        first = client.get(url)
+        etag = first.headers["ETag"]
+        assert etag
+
+        cached = client.get(url, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.data == b""
+
+        # Live bar moved -> new tag and a full body
+        fake_history.loc[fake_history.index[-1], "Close"] = 12.5
+        changed = client.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+
 @pytest.mark.usefixtures("clean_portfolio")
 class TestTradeEndpoint:
     def test_buy_crypto(self, client):
@@ -146,11 +241,74 @@ class TestTradeEndpoint:
 
         assert response.status_code == 400
 
+    def test_trade_is_on_disk_before_response(self, client, tmp_path, monkeypatch):
+        """Another process loading right after the response sees the trade."""
+        from datetime import datetime, timezone
+
+        from src.cli import load_portfolio
+        from src.data_fetcher import Quote
+
+        path = tmp_path / "portfolio.json"
+        save_portfolio(Portfolio(cash=1000.0), path)
+        monkeypatch.setattr(
+            api_server, "save_portfolio", lambda p: save_portfolio(p, path)
+        )
+        monkeypatch.setattr(api_server, "load_portfolio", lambda: load_portfolio(path))
+        quote = Quote(
+            ticker="AAPL",
+            price=10.0,
+            currency="USD",
+            timestamp=datetime(2026, 2, 1, tzinfo=timezone.utc),
+        )
+        monkeypatch.setattr(
+            api_server, "cached_fetch_latest_quote", lambda t, **_kw: quote
+        )
+        monkeypatch.setattr(
+            "src.transaction_manager.fetch_latest_quote", lambda t, **_kw: quote
+        )
+        monkeypatch.setattr(api_server, "SnapshotStore", lambda: None)
+
+        trade = {"action": "buy", "ticker": "AAPL", "quantity": 2.0}
+        response = client.post(
+            "/api/trade", data=json.dumps(trade), content_type="application/json"
+        )
+
+        assert response.status_code == 200
+        on_disk = json.loads(path.read_text(encoding="utf-8"))
+        assert on_disk["cash"] == 980.0
+        assert on_disk["holdings"] == {"AAPL": 2.0}
+
 
 # vulture: pytest fixture is used via dependency injection / usefixtures marker
 _ = clean_portfolio
 
 
+class TestPortfolioEndpoint:
+    def test_batch_prices_with_per_ticker_fallback(self, client, monkeypatch):
+        """Batch prices are used first; missing tickers fall back per ticker."""
+        import api_server
+        from src.data_fetcher import QuoteFetchError
+
+        portfolio = Portfolio(cash=1000.0, holdings={"AAPL": 2.0, "MSFT": 1.0})
+        monkeypatch.setattr(api_server, "load_portfolio", lambda: portfolio)
+        monkeypatch.setattr(
+            api_server, "fetch_latest_prices", lambda tickers: {"AAPL": 100.0}
+        )
+
+        def fake_quote(ticker, **_kwargs):
+            raise QuoteFetchError("not found")
+
+        monkeypatch.setattr(api_server, "cached_fetch_latest_quote", fake_quote)
+
+        response = client.get("/api/portfolio")
+        assert response.status_code == 200
+
+        data = json.loads(response.data)
+        assert data["total_value"] == 1200.0
+        assert data["holdings_detailed"]["AAPL"]["current_price"] == 100.0
+        assert data["holdings_detailed"]["MSFT"]["current_price"] is None
+
+
 class TestMarketsEndpoint:
     def test_get_markets(self, client):
         response = client.get("/api/markets")
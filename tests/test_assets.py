@@ -45,3 +45,25 @@ def test_asset_serialization_roundtrip():
     assert restored.price == original.price
     assert restored.name == original.name
     assert restored.timestamp == original.timestamp
+
+
+def test_to_dict_reflects_updated_timestamp():
+    """to_dict uses the current timestamp after update_price."""
+    asset = Asset(ticker="AAPL", price=100.0)
+    first = asset.to_dict()["timestamp"]
+
+    new_ts = datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc)
+    asset.update_price(101.0, timestamp=new_ts)
+
+    assert first != new_ts.isoformat()
+    assert asset.to_dict()["timestamp"] == new_ts.isoformat()
+    assert not hasattr(asset, "__dict__")
+
+
+def test_asset_fields_are_only_its_data():
+    from dataclasses import asdict, fields
+
+    asset = Asset(ticker="AAPL", price=100.0)
+
+    assert [f.name for f in fields(asset)] == ["ticker", "price", "timestamp", "name"]
+    assert set(asdict(asset)) == set(asset.to_dict())
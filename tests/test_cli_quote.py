@@ -29,7 +29,7 @@ def test_cmd_quote_outputs_currency_and_sek(monkeypatch, capsys) -> None:
             fx_rate_to_sek=10.54,
         )
 
-    monkeypatch.setattr("src.cli.fetch_latest_quote", fake_fetch_latest_quote)
+    monkeypatch.setattr("src.data_fetcher.fetch_latest_quote", fake_fetch_latest_quote)
 
     code = cmd_quote(" aapl ")
     assert code == 0
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import importlib
+import subprocess
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
@@ -50,6 +53,40 @@ def test_cli_help_exits_0(cli):
     assert exc.value.code == 0
 
 
+def test_cli_parser_only_adds_selected_command_args(cli):
+    # "--log-level quote" must not be mistaken for the quote command
+    argv = ["--log-level", "quote", "buy", "AAPL", "2"]
+    args = cli.build_parser(argv).parse_args(argv)
+
+    assert args.log_level == "quote"
+    assert args.command == "buy"
+    assert (args.ticker, args.quantity) == ("AAPL", 2.0)
+
+    # Parsers are reused per command and stay usable for later argv
+    assert cli.build_parser(["buy", "MSFT", "1"]) is cli.build_parser(argv)
+    assert (
+        cli.build_parser(["buy", "MSFT", "1"]).parse_args(["buy", "MSFT", "1"]).ticker
+        == "MSFT"
+    )
+
+    with pytest.raises(SystemExit):
+        cli.main(["sell", "AAPL"])  # missing quantity is still an error
+
+
+def test_cli_import_and_parser_skip_heavy_modules():
+    # Fresh interpreter: building the parser must not import yfinance/pandas
+    code = (
+        "import sys, src.cli as c; c.build_parser(); "
+        "heavy = {'yfinance', 'pandas'} & set(sys.modules); "
+        "sys.exit(len(heavy))"
+    )
+    repo_root = Path(__file__).resolve().parents[1]
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, cwd=repo_root, check=False
+    )
+    assert result.returncode == 0, result.stderr
+
+
 def test_cli_quote_offline_returns_0_and_prints(cli, monkeypatch, capsys):
     def fake_fetch(ticker: str):
         return FakeQuote(
@@ -60,7 +97,7 @@ def test_cli_quote_offline_returns_0_and_prints(cli, monkeypatch, capsys):
             company_name="Test Corp",
         )
 
-    monkeypatch.setattr(cli, "fetch_latest_quote", fake_fetch)
+    monkeypatch.setattr("src.data_fetcher.fetch_latest_quote", fake_fetch)
 
     rc = cli.main(["--log-level", "CRITICAL", "quote", "AAPL"])
     out = capsys.readouterr().out
@@ -88,7 +125,7 @@ def test_cli_buy_offline_returns_0(cli, monkeypatch, capsys):
                 gross_amount=100.0 * quantity,
             )
 
-    monkeypatch.setattr(cli, "TransactionManager", FakeTM)
+    monkeypatch.setattr("src.transactions.TransactionManager", FakeTM)
 
     rc = cli.main(["--log-level", "CRITICAL", "buy", "AAPL", "1"])
     out = capsys.readouterr().out
@@ -98,6 +135,31 @@ def test_cli_buy_offline_returns_0(cli, monkeypatch, capsys):
     assert "AAPL" in out
 
 
+def test_cli_portfolio_batches_prices_with_fallback(cli, monkeypatch, capsys):
+    from src.portfolio import Portfolio
+
+    portfolio = Portfolio(cash=100.0, holdings={"AAPL": 2.0, "MSFT": 1.0})
+    monkeypatch.setattr(cli, "load_portfolio", lambda: portfolio)
+    monkeypatch.setattr(
+        "src.data_fetcher.fetch_latest_prices", lambda tickers: {"AAPL": 10.0}
+    )
+
+    fetched: list[str] = []
+
+    def fake_fetch(ticker: str):
+        fetched.append(ticker)
+        return FakeQuote(ticker=ticker, price=5.0, timestamp=datetime.now(timezone.utc))
+
+    monkeypatch.setattr("src.data_fetcher.fetch_latest_quote", fake_fetch)
+
+    rc = cli.main(["--log-level", "CRITICAL", "portfolio"])
+    out = capsys.readouterr().out
+
+    assert rc == 0
+    assert fetched == ["MSFT"]
+    assert "125.00" in out  # 100 cash + 2*10 + 1*5
+
+
 def test_cli_save_then_load_offline_returns_0(cli, capsys):
     # save
     rc1 = cli.main(["--log-level", "CRITICAL", "save"])
@@ -110,3 +172,18 @@ def test_cli_save_then_load_offline_returns_0(cli, capsys):
     out2 = capsys.readouterr().out
     assert rc2 == 0
     assert "Loaded portfolio" in out2
+
+
+def test_unexpected_error_logs_traceback_only_at_debug(cli, monkeypatch, caplog):
+    def boom(*_args, **_kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(cli, "load_portfolio", boom)
+
+    with caplog.at_level("INFO", logger=cli.log.name):
+        assert cli.cmd_portfolio() == 1
+    errors = [r for r in caplog.records if r.levelname == "ERROR"]
+    assert len(errors) == 1
+    assert "boom" in errors[0].getMessage()
+    assert errors[0].exc_info is None
+    assert not [r for r in caplog.records if r.levelname == "DEBUG"]
@@ -1,5 +1,14 @@
+from dataclasses import replace
+from datetime import UTC, datetime, timezone
+
+from src.data_fetcher import Quote
 from src.portfolio import Portfolio
-from src.formatters import format_portfolio_output
+from src.formatters import (
+    MARKET_CLOSED_WARNING,
+    format_market_warning,
+    format_portfolio_output,
+    format_quote_line,
+)
 
 
 def test_empty_portfolio_shows_no_holdings_and_cash():
@@ -16,3 +25,51 @@ def test_total_value_calculated_from_price_map():
     out = format_portfolio_output(p, price_map={"ERIC-B": 100.0, "HM-B": 200.0})
 
     assert "Total value: 1400.00" in out
+
+
+def test_quote_line_with_and_without_sek():
+    q = Quote(
+        ticker="AAPL",
+        price=100.0,
+        currency="USD",
+        timestamp=datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc),
+        company_name="Apple Inc.",
+        price_sek=1050.0,
+        fx_pair="USDSEK=X",
+        fx_rate_to_sek=10.5,
+    )
+    line = format_quote_line(q)
+
+    assert line.startswith("AAPL (Apple Inc.) 100.00 USD | 1050.00 SEK")
+    assert line.endswith("(FX: USDSEK=X 10.5000)")
+
+    no_sek = format_quote_line(replace(q, price_sek=None), "MSFT")
+    assert no_sek.startswith("MSFT (Apple Inc.) 100.00 USD | SEK: N/A")
+
+
+def test_market_warning_only_for_non_regular_state():
+    q = Quote(
+        ticker="AAPL",
+        price=100.0,
+        currency="USD",
+        timestamp=datetime(2026, 2, 1, 12, 0, tzinfo=UTC),
+    )
+
+    assert format_market_warning(q) is None
+    assert format_market_warning(replace(q, market_state="REGULAR")) is None
+    assert format_market_warning(replace(q, market_state="CLOSED")) == (
+        MARKET_CLOSED_WARNING
+    )
+
+
+def test_missing_prices_are_warned_once(caplog):
+    p = Portfolio(cash=0.0, holdings={"AAA": 1, "BBB": 2, "CCC": 3})
+
+    with caplog.at_level("WARNING", logger="src.formatters"):
+        out = format_portfolio_output(p, price_map={"BBB": 10.0})
+
+    assert "- AAA qty=1  price unavailable" in out
+    assert "Total value: 20.00" in out
+    assert [r.getMessage() for r in caplog.records] == [
+        "Price unavailable for AAA, CCC"
+    ]
@@ -0,0 +1,46 @@
+# tests/test_json_utils.py
+
+"""
+Tests for the JSON helpers (orjson backend and stdlib fallback).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src import json_utils
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch) -> str:
+    """Run each test with orjson (when installed) and with the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_utils, "orjson", None)
+    elif json_utils.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_round_trip_returns_bytes(backend) -> None:
+    data = {"cash": 1000.5, "holdings": {"AAPL": 3}, "name": "Åkesson"}
+
+    encoded = json_utils.dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert json_utils.loads(encoded) == data
+    assert json_utils.loads(encoded.decode("utf-8")) == data
+
+
+def test_numpy_values_are_serialized(backend) -> None:
+    data = {"close": np.array([1.5, 2.5]), "volume": np.int64(7)}
+
+    assert json_utils.loads(json_utils.dumps(data)) == {
+        "close": [1.5, 2.5],
+        "volume": 7,
+    }
+
+
+def test_invalid_json_raises_decode_error(backend) -> None:
+    with pytest.raises(json_utils.JSONDecodeError):
+        json_utils.loads(b"{not json")
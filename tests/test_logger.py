@@ -33,3 +33,29 @@ def test_init_logging_is_idempotent(tmp_path: Path) -> None:
 
     # Default configuration: console + file handler = 2 handlers
     assert sum(isinstance(h, logging.FileHandler) for h in root.handlers) == 1
+
+
+def test_init_logging_reuses_open_file_handler(tmp_path: Path) -> None:
+    log_file = tmp_path / "app.log"
+
+    init_logging(level="INFO", log_file=log_file, console=False)
+    first = [
+        h for h in logging.getLogger().handlers if isinstance(h, logging.FileHandler)
+    ]
+
+    init_logging(level="WARNING", log_file=log_file, console=False)
+    second = [
+        h for h in logging.getLogger().handlers if isinstance(h, logging.FileHandler)
+    ]
+
+    assert len(second) == 1
+    assert second[0] is first[0]
+    assert not second[0].stream.closed
+
+    # A different file gets its own handler; the old one is closed
+    init_logging(level="INFO", log_file=tmp_path / "other.log", console=False)
+    third = [
+        h for h in logging.getLogger().handlers if isinstance(h, logging.FileHandler)
+    ]
+    assert third[0] is not first[0]
+    assert first[0].stream is None or first[0].stream.closed
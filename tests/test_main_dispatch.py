@@ -13,6 +13,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 
 
+import src.main as main_module
 from src.errors import FileError
 from src.main import SimDeps, SimState, dispatch_line, safe_dispatch
 from src.portfolio import Portfolio
@@ -78,6 +79,18 @@ def test_safe_dispatch_quote_success_prints_quote(capsys) -> None:
     assert "Fetched at:" in out
 
 
+def test_dispatch_handles_extra_whitespace_and_quoted_args(capsys) -> None:
+    state = SimState(portfolio=Portfolio())
+    seen: list[str] = []
+    deps = SimDeps(
+        fetch_quote=lambda t: seen.append(t) or _quote(t), save_pf=lambda p: None
+    )
+
+    assert dispatch_line("  quote \t msft  ", state, deps) is True
+    assert dispatch_line('quote "aapl"', state, deps) is True
+    assert seen == ["MSFT", "AAPL"]
+
+
 def test_safe_dispatch_quote_not_found_maps_to_friendly_message(capsys) -> None:
     def fake_fetch(_: str) -> Quote:
         raise QuoteFetchError("not found", code=FetchErrorCode.NOT_FOUND)
@@ -121,7 +134,11 @@ def test_safe_dispatch_sell_success_updates_portfolio_and_saves(capsys) -> None:
         saved["called"] = True
 
     state = SimState(portfolio=pf)
-    deps = SimDeps(fetch_quote=lambda t: _quote(t, price=50.0), save_pf=fake_save)
+    deps = SimDeps(
+        fetch_quote=lambda t: _quote(t, price=999.0),  # display only
+        fetch_trade_quote=lambda t: _quote(t, price=50.0),
+        save_pf=fake_save,
+    )
 
     assert safe_dispatch("sell AAPL 2", state, deps) is True
 
@@ -144,9 +161,192 @@ def test_safe_dispatch_sell_save_failure_is_caught(capsys) -> None:
         raise FileError("disk full")
 
     state = SimState(portfolio=pf)
-    deps = SimDeps(fetch_quote=lambda t: _quote(t, price=10.0), save_pf=fake_save)
+    deps = SimDeps(fetch_trade_quote=lambda t: _quote(t, price=10.0), save_pf=fake_save)
 
     assert safe_dispatch("sell AAPL 1", state, deps) is True
     out = capsys.readouterr().out
     assert "File error:" in out
     assert "disk full" in out
+
+
+def test_dispatch_trades_reuse_one_transaction_manager() -> None:
+    pf = Portfolio(cash=1000.0)
+    state = SimState(portfolio=pf)
+    deps = SimDeps(
+        fetch_trade_quote=lambda t: _quote(t, price=10.0), save_pf=lambda p: None
+    )
+
+    assert dispatch_line("buy AAPL 3", state, deps) is True
+    tm, store = state.tm, state.snapshot_store
+    assert dispatch_line("sell AAPL 1", state, deps) is True
+
+    assert tm is not None and state.tm is tm
+    assert state.snapshot_store is store
+    assert pf.holdings["AAPL"] == 2.0
+
+    # A replaced portfolio gets a fresh manager but keeps the snapshot store
+    state.portfolio = Portfolio(cash=500.0)
+    assert dispatch_line("buy AAPL 1", state, deps) is True
+    assert state.tm is not tm
+    assert state.tm.portfolio is state.portfolio
+    assert state.snapshot_store is store
+
+
+def test_dispatch_quotes_reuse_session_cache_but_trades_fetch_fresh(
+    monkeypatch,
+) -> None:
+    display: list[str] = []
+    trade: list[str] = []
+
+    def fake_fetch(ticker: str) -> Quote:
+        display.append(ticker)
+        return _quote(ticker, price=10.0)
+
+    def fake_trade_fetch(ticker: str) -> Quote:
+        trade.append(ticker)
+        return _quote(ticker, price=10.0)
+
+    state = SimState(portfolio=Portfolio(cash=1000.0))
+    deps = SimDeps(
+        fetch_quote=fake_fetch,
+        fetch_trade_quote=fake_trade_fetch,
+        save_pf=lambda p: None,
+    )
+
+    dispatch_line("quote AAPL", state, deps)
+    dispatch_line("quote AAPL", state, deps)
+    dispatch_line("buy AAPL 1", state, deps)
+    dispatch_line("sell AAPL 1", state, deps)
+    assert display == ["AAPL"]
+    assert trade == ["AAPL", "AAPL"]
+
+    # Expired entries are fetched again
+    monkeypatch.setattr(main_module, "SIM_QUOTE_TTL_SECONDS", 0.0)
+    dispatch_line("quote AAPL", state, deps)
+    assert display == ["AAPL", "AAPL"]
+
+
+def test_dispatch_report_prices_holdings_through_deps(monkeypatch, capsys) -> None:
+    captured = {}
+
+    def fake_report(*, portfolio, price_provider, recent_n, batch_price_provider):
+        captured["price"] = price_provider("AAPL")
+        captured["batch"] = batch_price_provider(["AAPL"])
+        captured["recent_n"] = recent_n
+        return "report.txt"
+
+    monkeypatch.setattr(main_module, "generate_and_write_report", fake_report)
+    state = SimState(portfolio=Portfolio(holdings={"AAPL": 1}))
+    deps = SimDeps(
+        fetch_quote=lambda t: _quote(t, price=42.0),
+        fetch_prices=lambda tickers: {t: 41.0 for t in tickers},
+        save_pf=lambda p: None,
+    )
+
+    assert dispatch_line("report 3", state, deps) is True
+    assert captured == {"price": 42.0, "batch": {"AAPL": 41.0}, "recent_n": 3}
+    assert "Report written to report.txt" in capsys.readouterr().out
+
+
+def test_dispatch_portfolio_value_prices_holdings_in_one_batch(capsys) -> None:
+    state = SimState(portfolio=Portfolio(cash=100.0, holdings={"AAPL": 2, "ODD": 1}))
+    batches: list[list[str]] = []
+    single: list[str] = []
+
+    def fetch_prices(tickers):
+        batches.append(list(tickers))
+        return {"AAPL": 50.0}
+
+    def fetch_quote(ticker):
+        single.append(ticker)
+        return _quote(ticker, price=25.0)
+
+    deps = SimDeps(
+        fetch_quote=fetch_quote, fetch_prices=fetch_prices, save_pf=lambda p: None
+    )
+
+    assert dispatch_line("portfolio value", state, deps) is True
+    out = capsys.readouterr().out
+    assert batches == [["AAPL", "ODD"]]
+    assert single == ["ODD"]
+    assert "Total value: 225.00" in out
+
+
+def test_dispatch_refresh_quotes_all_holdings_concurrently(capsys) -> None:
+    import threading
+
+    state = SimState(portfolio=Portfolio(holdings={"AAPL": 1, "MSFT": 2, "BAD": 1}))
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fetch_quote(ticker):
+        barrier.wait()  # only passes if all three fetches run at the same time
+        if ticker == "BAD":
+            raise QuoteFetchError("nope", code=FetchErrorCode.NOT_FOUND)
+        return _quote(ticker)
+
+    deps = SimDeps(fetch_quote=fetch_quote, save_pf=lambda p: None)
+
+    assert dispatch_line("refresh", state, deps) is True
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("AAPL (Test Corp) 100.00 USD")
+    assert lines[1].startswith("MSFT (Test Corp) 100.00 USD")
+    assert lines[2] == "BAD: quote unavailable"
+
+
+def test_run_simulation_reads_piped_stdin_without_prompts(monkeypatch, capsys) -> None:
+    import io
+    import sys
+
+    saved: list[Portfolio] = []
+    monkeypatch.setattr(
+        main_module,
+        "SimDeps",
+        lambda: SimDeps(
+            fetch_quote=lambda t: _quote(t),
+            load_pf=lambda: Portfolio(cash=50.0),
+            save_pf=saved.append,
+        ),
+    )
+    monkeypatch.setattr("sys.stdin", io.StringIO("\nportfolio\nexit\nquote AAPL\n"))
+
+    main_module.run_simulation()
+
+    out = capsys.readouterr().out
+    assert "TradeSim (Active) >" not in out
+    assert "Cash: 50.00" in out
+    assert "Saving data..." in out
+    assert "100.00 USD" not in out  # stops at exit
+    assert saved == []  # nothing traded, nothing to save
+    assert sys.stdin.readline() == "quote AAPL\n"  # left open for the menu
+
+
+def test_run_simulation_exit_saves_only_after_failed_trade_save(
+    monkeypatch, capsys
+) -> None:
+    import io
+
+    attempts: list[float] = []
+
+    def flaky_save(pf: Portfolio) -> None:
+        attempts.append(pf.cash)
+        if len(attempts) == 2:  # the sell's save fails
+            raise FileError("disk full")
+
+    monkeypatch.setattr(
+        main_module,
+        "SimDeps",
+        lambda: SimDeps(
+            fetch_trade_quote=lambda t: _quote(t, price=10.0),
+            load_pf=lambda: Portfolio(cash=100.0),
+            save_pf=flaky_save,
+        ),
+    )
+
+    monkeypatch.setattr("sys.stdin", io.StringIO("buy AAPL 1\nexit\n"))
+    main_module.run_simulation()
+    assert attempts == [90.0]  # saved by the trade, not again on exit
+
+    attempts.clear()
+    monkeypatch.setattr("sys.stdin", io.StringIO("buy AAPL 1\nsell AAPL 1\nexit\n"))
+    main_module.run_simulation()
+    assert attempts == [90.0, 100.0, 100.0]  # failed sell save retried on exit
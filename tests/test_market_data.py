@@ -1,3 +1,4 @@
+from datetime import UTC, datetime
 from unittest.mock import patch
 import pytest
 
@@ -77,3 +78,412 @@ def test_fetch_latest_quote_network_error(mock_ticker):
         fetch_latest_quote("MSFT")
 
     assert exc.value.code == FetchErrorCode.NETWORK
+
+
+@patch("src.data_fetcher.yf.download")
+def test_fetch_latest_prices_batches_and_skips_missing(mock_download):
+    import pandas as pd
+
+    from src.data_fetcher import fetch_latest_prices
+
+    columns = pd.MultiIndex.from_product([["AAPL", "MSFT"], ["Close"]])
+    mock_download.return_value = pd.DataFrame(
+        [[100.0, None], [101.5, None]], columns=columns
+    )
+
+    prices = fetch_latest_prices(["aapl", "MSFT", "AAPL", "  "])
+
+    mock_download.assert_called_once()
+    assert mock_download.call_args.args[0] == ["AAPL", "MSFT"]
+    assert prices == {"AAPL": 101.5}
+
+
+@patch("src.data_fetcher.yf.download")
+def test_fetch_latest_prices_returns_empty_on_error(mock_download):
+    mock_download.side_effect = Exception("Connection timeout")
+    _ = mock_download.side_effect  # used by unittest.mock (silence vulture)
+
+    from src.data_fetcher import fetch_latest_prices
+
+    assert fetch_latest_prices(["AAPL"]) == {}
+
+
+def test_fetch_prices_concurrently_skips_failures_and_timeouts():
+    import threading
+    from types import SimpleNamespace
+
+    from src.data_fetcher import QuoteFetchError, fetch_prices_concurrently
+
+    release = threading.Event()
+
+    def fake_fetch(ticker):
+        if ticker == "BAD":
+            raise QuoteFetchError("not found")
+        if ticker == "SLOW":
+            release.wait(timeout=5)
+        return SimpleNamespace(price=10.0)
+
+    try:
+        prices = fetch_prices_concurrently(
+            ["AAPL", "BAD", "SLOW", "AAPL"], fetch=fake_fetch, timeout=0.2
+        )
+    finally:
+        release.set()
+
+    assert prices == {"AAPL": 10.0}
+
+
+@patch("src.data_fetcher.yf.Ticker")
+def test_fetch_latest_quote_reuses_fresh_quote(mock_ticker, monkeypatch):
+    from src import data_fetcher
+
+    monkeypatch.setattr(data_fetcher, "_quote_cache", {})
+    monkeypatch.setattr(data_fetcher, "_quote_cache_loaded", True)
+    monkeypatch.setattr(data_fetcher, "_quote_cache_dirty", False)
+
+    info = {"marketState": "REGULAR", "currency": "SEK", "shortName": "Test AB"}
+    fake = mock_ticker.return_value
+    fake.fast_info = {"last_price": 100.0}
+    fake.info = info
+    fake.get_info.return_value = info
+
+    first = data_fetcher.fetch_latest_quote("test.st")
+    calls_after_first = mock_ticker.call_count
+    second = data_fetcher.fetch_latest_quote("TEST.ST")
+
+    assert second is first
+    assert mock_ticker.call_count == calls_after_first
+
+    # Trades ask for a fresh price
+    data_fetcher.fetch_latest_quote("TEST.ST", use_cache=False)
+    assert mock_ticker.call_count > calls_after_first
+
+
+def test_save_quote_cache_merges_with_file_on_disk(tmp_path, monkeypatch):
+    import json
+    import time
+
+    from src import data_fetcher
+
+    cache_file = tmp_path / "quote_cache.json"
+    now = time.time()
+    other = {"ticker": "MSFT", "price": 300.0, "currency": "USD"}
+    cache_file.write_text(
+        json.dumps(
+            {
+                "MSFT": [now - 1, other],
+                "STALE": [now - 10_000, other],
+                "__not_found__": {"NOPE": now + 60, "AAPL": now + 60},
+            }
+        ),
+        encoding="utf-8",
+    )
+    quote = data_fetcher.Quote(
+        ticker="AAPL",
+        price=10.0,
+        currency="USD",
+        timestamp=datetime(2025, 1, 1, tzinfo=UTC),
+    )
+    monkeypatch.setattr(data_fetcher, "QUOTE_CACHE_FILE", cache_file)
+    monkeypatch.setattr(data_fetcher, "_quote_cache", {"AAPL": (now, quote)})
+    monkeypatch.setattr(data_fetcher, "_not_found", {})
+    monkeypatch.setattr(data_fetcher, "_quote_cache_dirty", True)
+
+    data_fetcher._save_quote_cache()
+
+    saved = json.loads(cache_file.read_text(encoding="utf-8"))
+    assert set(saved) == {"AAPL", "MSFT", "__not_found__"}
+    assert saved["AAPL"][1]["price"] == 10.0
+    assert saved["__not_found__"] == {"NOPE": now + 60}
+    assert list(tmp_path.iterdir()) == [cache_file]
+
+
+def test_try_history_price_uses_one_daily_request():
+    import pandas as pd
+
+    from src.data_fetcher import _try_history_price
+
+    class FakeTicker:
+        def __init__(self, frame):
+            self.frame = frame
+            self.calls = []
+
+        def history(self, period, interval, **_kwargs):
+            self.calls.append((period, interval))
+            return self.frame
+
+    fake = FakeTicker(pd.DataFrame({"Close": [10.0, 11.5, float("nan")]}))
+    assert _try_history_price(fake) == 11.5
+    assert fake.calls == [("5d", "1d")]
+
+    empty = FakeTicker(pd.DataFrame())
+    assert _try_history_price(empty) is None
+    assert empty.calls == [("5d", "1d")]
+
+
+@patch("src.data_fetcher.yf.Ticker")
+def test_fetch_latest_quote_remembers_not_found(mock_ticker, monkeypatch):
+    from src import data_fetcher
+
+    monkeypatch.setattr(data_fetcher, "_quote_cache", {})
+    monkeypatch.setattr(data_fetcher, "_not_found", {})
+    monkeypatch.setattr(data_fetcher, "_quote_cache_loaded", True)
+    monkeypatch.setattr(data_fetcher, "_quote_cache_dirty", False)
+    monkeypatch.setattr(
+        data_fetcher, "_get_info", lambda _t: {"marketState": "REGULAR"}
+    )
+
+    fake = mock_ticker.return_value
+    fake.fast_info = {}
+    fake.history.return_value = None
+
+    for _ in range(2):
+        with pytest.raises(data_fetcher.QuoteFetchError) as exc:
+            data_fetcher.fetch_latest_quote("TYPO1")
+        assert exc.value.code == data_fetcher.FetchErrorCode.NOT_FOUND
+    assert mock_ticker.call_count == 1
+
+    # Trades bypass the negative cache
+    with pytest.raises(data_fetcher.QuoteFetchError):
+        data_fetcher.fetch_latest_quote("TYPO1", use_cache=False)
+    assert mock_ticker.call_count == 2
+
+
+@patch("src.data_fetcher.yf.Ticker")
+def test_fetch_latest_quote_does_not_cache_outage_as_not_found(
+    mock_ticker, monkeypatch
+):
+    from src import data_fetcher
+
+    monkeypatch.setattr(data_fetcher, "_quote_cache", {})
+    monkeypatch.setattr(data_fetcher, "_not_found", {})
+    monkeypatch.setattr(data_fetcher, "_quote_cache_loaded", True)
+    monkeypatch.setattr(data_fetcher, "_quote_cache_dirty", False)
+    monkeypatch.setattr(data_fetcher, "_get_info", lambda _t: {})
+
+    class DownFastInfo:
+        @property
+        def last_price(self):
+            raise ConnectionError("dns failure")
+
+    fake = mock_ticker.return_value
+    fake.fast_info = DownFastInfo()
+    fake.history.side_effect = ConnectionError("dns failure")
+
+    with pytest.raises(data_fetcher.QuoteFetchError) as exc:
+        data_fetcher.fetch_latest_quote("NOPRICE1")
+    assert exc.value.code == data_fetcher.FetchErrorCode.NETWORK
+
+    # Empty history after a failed fast_info: reported, but not cached
+    fake.history.side_effect = None
+    fake.history.return_value = None
+    with pytest.raises(data_fetcher.QuoteFetchError) as exc:
+        data_fetcher.fetch_latest_quote("NOPRICE1")
+    assert exc.value.code == data_fetcher.FetchErrorCode.NOT_FOUND
+    assert data_fetcher._not_found == {}
+
+
+def test_try_history_price_treats_missing_data_as_none():
+    from yfinance.exceptions import YFPricesMissingError
+
+    from src.data_fetcher import _try_history_price
+
+    class MissingTicker:
+        def history(self, **_kwargs):
+            raise YFPricesMissingError("TYPO1", "")
+
+    class DownTicker:
+        def history(self, **_kwargs):
+            raise ConnectionError("dns failure")
+
+    assert _try_history_price(MissingTicker()) is None
+    with pytest.raises(ConnectionError):
+        _try_history_price(DownTicker())
+
+
+@patch("src.data_fetcher.yf.Ticker")
+def test_fetch_latest_quote_fetches_info_once(mock_ticker, monkeypatch):
+    from src import data_fetcher
+
+    monkeypatch.setattr(data_fetcher, "_info_cache", {})
+    monkeypatch.setattr(data_fetcher, "_company_names", {})
+    info = {"marketState": "CLOSED", "currency": "sek", "shortName": "Test AB"}
+    fake = mock_ticker.return_value
+    fake.fast_info = {"last_price": 100.0}
+    fake.get_info.return_value = info
+
+    quotes = [
+        data_fetcher.fetch_latest_quote("INFO.ST", use_cache=False) for _ in range(2)
+    ]
+
+    assert fake.get_info.call_count == 1
+    assert {(q.currency, q.company_name) for q in quotes} == {("SEK", "Test AB")}
+
+
+@patch("src.data_fetcher.yf.download")
+def test_fetch_latest_prices_chunks_large_batches(mock_download):
+    import pandas as pd
+
+    from src.data_fetcher import PRICE_BATCH_SIZE, fetch_latest_prices
+
+    def fake_download(symbols, **_kwargs):
+        if "T0" in symbols:
+            raise ConnectionError("chunk failed")
+        columns = pd.MultiIndex.from_product([symbols, ["Close"]])
+        return pd.DataFrame([[1.0] * len(symbols)], columns=columns)
+
+    mock_download.side_effect = fake_download
+    symbols = [f"T{i}" for i in range(PRICE_BATCH_SIZE + 5)]
+
+    prices = fetch_latest_prices(symbols)
+
+    assert [len(c.args[0]) for c in mock_download.call_args_list] == [
+        PRICE_BATCH_SIZE,
+        5,
+    ]
+    assert sorted(prices) == sorted(symbols[PRICE_BATCH_SIZE:])
+
+
+@patch("src.data_fetcher.yf.Ticker")
+def test_fetch_latest_quote_fetches_metadata_beside_price(mock_ticker, monkeypatch):
+    import threading
+    from types import SimpleNamespace
+
+    from src import data_fetcher
+
+    monkeypatch.setattr(data_fetcher, "_info_cache", {})
+    monkeypatch.setattr(data_fetcher, "_fx_cache", {})
+    info_threads: list[str] = []
+
+    def get_info():
+        info_threads.append(threading.current_thread().name)
+        return {"marketState": "REGULAR", "currency": "USD", "shortName": "Meta Inc"}
+
+    def make_ticker(symbol):
+        price = 10.0 if symbol == "USDSEK=X" else 50.0
+        return SimpleNamespace(
+            ticker=symbol, fast_info={"last_price": price}, get_info=get_info
+        )
+
+    mock_ticker.side_effect = make_ticker
+
+    quote = data_fetcher.fetch_latest_quote("META1", use_cache=False)
+
+    assert info_threads and info_threads[0] != threading.current_thread().name
+    assert (quote.price, quote.currency) == (50.0, "USD")
+    assert (quote.fx_pair, quote.fx_rate_to_sek, quote.price_sek) == (
+        "USDSEK=X",
+        10.0,
+        500.0,
+    )
+
+
+@patch("src.data_fetcher.yf.Ticker")
+def test_fx_rate_is_cached_per_pair(mock_ticker, monkeypatch):
+    from src import data_fetcher
+
+    monkeypatch.setattr(data_fetcher, "_fx_cache", {})
+    mock_ticker.return_value.fast_info = {"last_price": 11.0}
+
+    assert data_fetcher._try_fx_rate("usd") == ("USDSEK=X", 11.0)
+    assert data_fetcher._try_fx_rate("USD") == ("USDSEK=X", 11.0)
+    assert data_fetcher._try_fx_rate("SEK") == ("SEK", 1.0)
+    assert mock_ticker.call_count == 1
+
+    monkeypatch.setattr(data_fetcher, "FX_TTL_SECONDS", 0.0)
+    data_fetcher._try_fx_rate("USD")
+    assert mock_ticker.call_count == 2
+
+
+def test_concurrent_quote_fetches_share_one_upstream_call(monkeypatch):
+    import threading
+    import time
+
+    from src import data_fetcher
+
+    class CountingInflight(dict):
+        joined = 0
+
+        def get(self, key, default=None):
+            value = super().get(key, default)
+            if value is not None:
+                self.joined += 1
+            return value
+
+    inflight = CountingInflight()
+    monkeypatch.setattr(data_fetcher, "_inflight", inflight)
+    monkeypatch.setattr(data_fetcher, "_quote_cache", {})
+    monkeypatch.setattr(data_fetcher, "_not_found", {})
+    monkeypatch.setattr(data_fetcher, "_quote_cache_loaded", True)
+
+    started, release = threading.Event(), threading.Event()
+    fetched: list[str] = []
+
+    def slow_fetch(ticker):
+        fetched.append(ticker)
+        started.set()
+        release.wait(timeout=5)
+        return f"quote:{ticker}"
+
+    monkeypatch.setattr(data_fetcher, "_fetch_uncached", slow_fetch)
+
+    results: list[str] = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(data_fetcher.fetch_latest_quote("HOT"))
+        )
+        for _ in range(4)
+    ]
+    threads[0].start()
+    started.wait(timeout=5)
+    for t in threads[1:]:
+        t.start()
+
+    deadline = time.monotonic() + 5
+    while inflight.joined < 3:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert fetched == ["HOT"]
+    assert results == ["quote:HOT"] * 4
+    assert not inflight
+
+
+@patch("src.data_fetcher.yf.Ticker")
+def test_skip_market_check_env_silences_closed_warning(
+    mock_ticker, monkeypatch, capsys
+):
+    from src import data_fetcher
+
+    monkeypatch.setattr(data_fetcher, "_info_cache", {})
+    fake = mock_ticker.return_value
+    fake.fast_info = {"last_price": 5.0}
+    fake.get_info.return_value = {"marketState": "CLOSED", "currency": "SEK"}
+
+    quote = data_fetcher.fetch_latest_quote("SKIP.ST", use_cache=False)
+    assert quote.market_state == "CLOSED"
+    # The fetch path (worker threads) never prints; callers show the warning
+    assert capsys.readouterr().out == ""
+
+    monkeypatch.setenv(data_fetcher.SKIP_MARKET_CHECK_ENV, "1")
+    quote = data_fetcher.fetch_latest_quote("SKIP.ST", use_cache=False)
+    assert quote.market_state is None
+
+
+def test_try_fast_info_price_reads_last_price_attribute():
+    from types import SimpleNamespace
+
+    from src.data_fetcher import _try_fast_info_price
+
+    class FastInfoLike:
+        last_price = 42.5
+
+        def get(self, _key, _default=None):
+            raise AssertionError("dict-style lookup not expected")
+
+    assert _try_fast_info_price(SimpleNamespace(fast_info=FastInfoLike())) == 42.5
+    assert _try_fast_info_price(SimpleNamespace(fast_info={"last_price": 7})) == 7.0
+    assert _try_fast_info_price(SimpleNamespace(fast_info=None)) is None
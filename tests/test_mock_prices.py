@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
 
+import pytest
+
 from src.data_fetcher import load_mock_prices
 
 
@@ -12,3 +14,34 @@ def test_load_mock_prices_reads_json(tmp_path: Path):
 
     data = load_mock_prices(p)
     assert data["AAPL"]["price"] == 100.0
+
+
+def test_quote_from_mock_reparses_only_when_file_changes(tmp_path: Path, monkeypatch):
+    from src import data_fetcher
+
+    p = tmp_path / "mock_prices.json"
+    p.write_text(json.dumps({"AAPL": {"price": 100.0, "currency": "USD"}}))
+    monkeypatch.setattr(data_fetcher, "MOCK_PRICES_FILE", p)
+    monkeypatch.setattr(data_fetcher, "_mock_cache", {})
+
+    parses = []
+    real_loads = data_fetcher.json_utils.loads
+    monkeypatch.setattr(
+        data_fetcher.json_utils, "loads", lambda b: parses.append(1) or real_loads(b)
+    )
+
+    assert data_fetcher._quote_from_mock("aapl").price == 100.0
+    assert data_fetcher._quote_from_mock("AAPL").price == 100.0
+    assert len(parses) == 1
+
+    p.write_text(json.dumps({"AAPL": {"price": 250.5, "currency": "USD"}}))
+    assert data_fetcher._quote_from_mock("AAPL").price == 250.5
+    assert len(parses) == 2
+
+
+def test_load_mock_prices_rejects_invalid_json(tmp_path: Path):
+    p = tmp_path / "mock_prices.json"
+    p.write_bytes(b'{"AAPL": ')
+
+    with pytest.raises(ValueError, match="Invalid JSON"):
+        load_mock_prices(p)
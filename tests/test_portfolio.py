@@ -2,7 +2,7 @@ import json
 from pathlib import Path
 import pytest
 
-from src.portfolio import Portfolio
+from src.portfolio import Portfolio, load_portfolio, parse_portfolio_dict
 
 
 def test_portfolio_default_cash():
@@ -90,6 +90,7 @@ def test_portfolio_save_creates_file_and_valid_json(tmp_path: Path):
 
     assert ok is True
     assert out_file.exists()
+    assert not (tmp_path / "portfolio.json.tmp").exists()
 
     data = json.loads(out_file.read_text(encoding="utf-8"))
     assert data["schema_version"] == 1
@@ -98,19 +99,100 @@ def test_portfolio_save_creates_file_and_valid_json(tmp_path: Path):
     assert data["holdings"] == {"AAPL": 2.0}
 
 
-def test_portfolio_save_handles_write_error(monkeypatch, tmp_path: Path, capsys):
+def test_portfolio_save_handles_write_error(tmp_path: Path, capsys):
     p = Portfolio(cash=10.0)
     p.holdings["MSFT"] = 1
 
-    out_file = tmp_path / "portfolio.json"
-
-    def _boom(*args, **_kwargs):
-        raise PermissionError("nope")
-
-    monkeypatch.setattr(Path, "write_text", _boom)
+    # Parent "directory" is a regular file, so creating/writing the file fails
+    blocker = tmp_path / "blocker"
+    blocker.write_text("", encoding="utf-8")
+    out_file = blocker / "portfolio.json"
 
     ok = p.save(out_file)
     assert ok is False
 
     captured = capsys.readouterr()
     assert "ERROR: Could not save portfolio" in captured.out
+
+
+def test_to_dict_shares_holdings_without_copy():
+    p = Portfolio(cash=5.0, holdings={"AAPL": 1.0})
+
+    data = p.to_dict()
+
+    assert data == {"cash": 5.0, "holdings": {"AAPL": 1.0}}
+    assert data["holdings"] is p.holdings
+
+
+def test_buy_and_sell_do_not_write_to_disk(monkeypatch):
+    p = Portfolio(cash=1000.0)
+
+    def _no_save(*_args, **_kwargs):
+        raise AssertionError("buy/sell must not save")
+
+    monkeypatch.setattr(Portfolio, "save", _no_save)
+
+    p.buy("AAPL", quantity=2, price=100.0)
+    p.sell("AAPL", quantity=1, price=100.0)
+
+    assert p.holdings == {"AAPL": 1}
+    assert p.cash == 900.0
+
+
+def test_portfolio_is_slotted():
+    p = Portfolio()
+
+    assert not hasattr(p, "__dict__")
+    with pytest.raises(AttributeError):
+        p.unknown = 1
+
+
+def test_total_value_skips_unpriced_and_zero_holdings():
+    p = Portfolio(cash=100.0, holdings={"AAPL": 2, "GONE": 0, "NOPRICE": 5})
+
+    assert p.total_value({"AAPL": 10.0, "GONE": 99.0}) == 120.0
+
+
+def test_parse_portfolio_dict_normalizes_and_drops_zero_holdings():
+    p = parse_portfolio_dict(
+        {"schema_version": 1, "cash": 5, "holdings": {"aapl": 2, "msft": 0}}
+    )
+
+    assert p.cash == 5.0
+    assert p.holdings == {"AAPL": 2.0}
+
+
+@pytest.mark.parametrize(
+    ("holdings", "message"),
+    [
+        ({" ": 1}, "Invalid ticker format"),
+        ({"AAPL": "2"}, "Invalid quantity type for AAPL: str"),
+        ({"AAPL": 1, "MSFT": -1}, "Quantity cannot be negative for MSFT: -1.0"),
+    ],
+)
+def test_parse_portfolio_dict_rejects_invalid_holdings(holdings, message):
+    with pytest.raises(ValueError, match=message):
+        parse_portfolio_dict({"schema_version": 1, "cash": 0, "holdings": holdings})
+
+
+def test_load_portfolio_round_trips_saved_file(tmp_path: Path):
+    out_file = tmp_path / "portfolio.json"
+    Portfolio(cash=12.5, holdings={"AAPL": 3.0}).save(out_file)
+
+    loaded = load_portfolio(out_file)
+
+    assert loaded.cash == 12.5
+    assert loaded.holdings == {"AAPL": 3.0}
+
+
+def test_autosave_saves_after_each_trade(monkeypatch):
+    saves: list[float] = []
+    monkeypatch.setattr(
+        Portfolio, "save", lambda self, path=None: saves.append(self.cash)
+    )
+
+    p = Portfolio(cash=1000.0, autosave=True)
+    p.buy("AAPL", quantity=2, price=100.0)
+    p.sell("AAPL", quantity=2, price=100.0)
+
+    assert saves == [800.0, 1000.0]
@@ -16,3 +16,55 @@ def test_portfolio_save_load_roundtrip(tmp_path):
     # Assert
     assert loaded.cash == pytest.approx(1234.56)
     assert loaded.holdings == {"AAPL": 2, "TSLA": 1}
+
+
+def test_save_portfolio_skips_unchanged_and_rewrites_changes(tmp_path):
+    p = Portfolio(cash=1000.0, holdings={"AAPL": 2})
+    path = tmp_path / "portfolio.json"
+
+    save_portfolio(p, path=path)
+    first_mtime = path.stat().st_mtime_ns
+
+    # Same content -> no rewrite
+    save_portfolio(p, path=path)
+    assert path.stat().st_mtime_ns == first_mtime
+
+    # In-place mutation (as TransactionManager does) -> rewritten
+    p.holdings["AAPL"] = 3
+    save_portfolio(p, path=path)
+    assert load_portfolio(path=path).holdings == {"AAPL": 3}
+
+    # File removed behind our back -> written again
+    path.unlink()
+    save_portfolio(p, path=path)
+    assert path.exists()
+    assert not path.with_suffix(".json.tmp").exists()
+
+
+def test_load_portfolio_invalid_json_returns_default(tmp_path):
+    path = tmp_path / "portfolio.json"
+    path.write_bytes(b'{"cash": 12.5, "holdings": ')
+
+    loaded = load_portfolio(path=path)
+
+    assert loaded.cash == Portfolio().cash
+    assert loaded.holdings == {}
+
+
+def test_load_portfolio_sees_same_size_rewrite_in_same_mtime(tmp_path):
+    """Another process may rewrite the file without changing its stat()."""
+    import os
+
+    path = tmp_path / "portfolio.json"
+    path.write_bytes(b'{"cash": 50.0, "holdings": {"AAPL": 1}}')
+    st = path.stat()
+
+    first = load_portfolio(path=path)
+    assert first.cash == pytest.approx(50.0)
+
+    path.write_bytes(b'{"cash": 75.0, "holdings": {"MSFT": 1}}')  # same size
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    second = load_portfolio(path=path)
+    assert second.cash == pytest.approx(75.0)
+    assert second.holdings == {"MSFT": 1}
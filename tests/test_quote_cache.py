@@ -0,0 +1,125 @@
+# tests/test_quote_cache.py
+
+"""
+Tests for the optional Redis-backed quote cache used by the API server.
+
+A tiny in-memory fake replaces Redis so the tests run offline.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+
+from src import quote_cache
+from src.data_fetcher import Quote
+
+
+class FakeRedis:
+    """Minimal stand-in for redis.Redis (get/setex only)."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    def get(self, key: str) -> str | None:
+        return self.store.get(key)
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+
+class BrokenRedis:
+    """Redis stand-in that fails on every call."""
+
+    def get(self, key: str) -> str | None:
+        raise ConnectionError("redis down")
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        raise ConnectionError("redis down")
+
+
+def _quote(ticker: str = "AAPL", price: float = 100.0) -> Quote:
+    return Quote(
+        ticker=ticker,
+        price=price,
+        currency="USD",
+        timestamp=datetime(2026, 2, 1, 12, 0, 0, tzinfo=UTC),
+        company_name="Test Corp",
+        price_sek=1000.0,
+        fx_pair="USDSEK=X",
+        fx_rate_to_sek=10.0,
+    )
+
+
+@pytest.fixture
+def calls(monkeypatch) -> list[str]:
+    """Replace the upstream fetch and record every call."""
+    seen: list[str] = []
+
+    def fake_fetch(ticker: str, **_kwargs) -> Quote:
+        seen.append(ticker)
+        return _quote(ticker.upper())
+
+    monkeypatch.setattr(quote_cache, "fetch_latest_quote", fake_fetch)
+    return seen
+
+
+def test_second_call_is_served_from_cache(monkeypatch, calls) -> None:
+    fake = FakeRedis()
+    monkeypatch.setattr(quote_cache, "_get_client", lambda: fake)
+
+    first = quote_cache.cached_fetch_latest_quote("aapl", ttl=5)
+    second = quote_cache.cached_fetch_latest_quote("AAPL", ttl=5)
+
+    assert calls == ["aapl"]
+    assert fake.ttls["quote:AAPL"] == 5
+    assert second == first
+
+
+def test_ttl_zero_bypasses_read_but_refreshes(monkeypatch, calls) -> None:
+    fake = FakeRedis()
+    monkeypatch.setattr(quote_cache, "_get_client", lambda: fake)
+
+    quote_cache.cached_fetch_latest_quote("AAPL", ttl=5)
+    quote_cache.cached_fetch_latest_quote("AAPL", ttl=0)
+
+    assert calls == ["AAPL", "AAPL"]
+    assert "quote:AAPL" in fake.store
+
+
+def test_redis_errors_fall_back_to_fetch(monkeypatch, calls) -> None:
+    monkeypatch.setattr(quote_cache, "_get_client", lambda: BrokenRedis())
+
+    quote = quote_cache.cached_fetch_latest_quote("MSFT")
+
+    assert calls == ["MSFT"]
+    assert quote.ticker == "MSFT"
+
+
+def test_no_client_means_no_caching(monkeypatch, calls) -> None:
+    monkeypatch.setattr(quote_cache, "_get_client", lambda: None)
+
+    quote_cache.cached_fetch_latest_quote("AAPL")
+    quote_cache.cached_fetch_latest_quote("AAPL")
+
+    assert calls == ["AAPL", "AAPL"]
+
+
+def test_misses_use_fetcher_cache_unless_bypassed(monkeypatch) -> None:
+    """Coalescing is left to fetch_latest_quote's single-flight fetch."""
+    monkeypatch.setattr(quote_cache, "_get_client", lambda: None)
+    seen: list[tuple[str, bool]] = []
+
+    def fake_fetch(ticker: str, *, use_cache: bool = True) -> Quote:
+        seen.append((ticker, use_cache))
+        return _quote(ticker.upper())
+
+    monkeypatch.setattr(quote_cache, "fetch_latest_quote", fake_fetch)
+
+    quote_cache.cached_fetch_latest_quote("AAPL", ttl=5)
+    quote_cache.cached_fetch_latest_quote("AAPL", ttl=0)
+
+    assert seen == [("AAPL", True), ("AAPL", False)]
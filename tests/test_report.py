@@ -142,3 +142,163 @@ def test_report_includes_recent_trades_and_pl(
     # Recent trades section should include both trades (N=2)
     assert "Recent trades (last 2)" in text
     assert "BUY" in text
+
+
+def test_report_streams_jsonl_history_for_count_period_and_recent(
+    tmp_path: Path,
+) -> None:
+    """JSON Lines history: full count/range, only the last N trades kept."""
+    tx_path = tmp_path / "transactions.jsonl"
+    stamps = ["2026-02-05T10:05:00Z", "2026-02-05T09:00:00Z", "2026-02-05T11:00:00Z"]
+    lines = [
+        json.dumps(
+            {"timestamp": ts, "side": "BUY", "ticker": t, "quantity": 1, "price": 10}
+        )
+        for ts, t in zip(stamps, ["AAPL", "MSFT", "NVDA"])
+    ]
+    lines.insert(1, json.dumps({"side": "HOLD", "ticker": "BAD", "quantity": 1}))
+    tx_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    data = build_report_data(
+        portfolio=Portfolio(cash=0.0),
+        transactions_path=tx_path,
+        price_provider=lambda _t: 0.0,
+        clock=_fixed_clock,
+        recent_n=2,
+    )
+
+    assert data.trades_count == 3
+    assert (data.period_start, data.period_end) == (
+        "2026-02-05T09:00:00Z",
+        "2026-02-05T11:00:00Z",
+    )
+    assert [t.ticker for t in data.recent_trades] == ["NVDA", "MSFT"]
+
+
+def test_report_reuses_scan_until_history_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import src.reporting as reporting_mod
+
+    tx_path = tmp_path / "transactions.jsonl"
+    record = {"side": "BUY", "ticker": "AAPL", "quantity": 1, "price": 10}
+    tx_path.write_text(json.dumps(record) + "\n", encoding="utf-8")
+
+    scans: list[Path] = []
+    real_scan = reporting_mod._scan_trade_history_uncached
+
+    def counting_scan(path: Path, recent_n: int):
+        scans.append(path)
+        return real_scan(path, recent_n)
+
+    monkeypatch.setattr(reporting_mod, "_scan_trade_history_uncached", counting_scan)
+
+    def build():
+        return build_report_data(
+            portfolio=Portfolio(cash=0.0),
+            transactions_path=tx_path,
+            price_provider=lambda _t: 0.0,
+            clock=_fixed_clock,
+        )
+
+    assert build().trades_count == 1
+    assert build().trades_count == 1
+    assert len(scans) == 1
+
+    with tx_path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    assert build().trades_count == 2
+    assert len(scans) == 2
+
+
+def test_report_prices_holdings_in_one_batch_with_fallback(tmp_path: Path) -> None:
+    batches: list[list[str]] = []
+    singles: list[str] = []
+
+    def batch(tickers):
+        batches.append(list(tickers))
+        return {"AAPL": 10.0}
+
+    def single(ticker: str) -> float:
+        singles.append(ticker)
+        return 5.0
+
+    data = build_report_data(
+        portfolio=Portfolio(cash=0.0, holdings={"AAPL": 1.0, "MSFT": 2.0}),
+        transactions_path=tmp_path / "none.jsonl",
+        price_provider=single,
+        batch_price_provider=batch,
+        clock=_fixed_clock,
+    )
+
+    assert batches == [["AAPL", "MSFT"]]
+    assert singles == ["MSFT"]
+    assert data.prices == {"AAPL": 10.0, "MSFT": 5.0}
+    assert data.holdings_value == 20.0
+
+
+def test_report_jsonl_fast_path_matches_defensive_parsing(tmp_path: Path) -> None:
+    import src.reporting as reporting_mod
+
+    canonical = {
+        "timestamp": "2026-02-05T10:00:00.000000Z",
+        "side": "BUY",
+        "ticker": "AAPL",
+        "quantity": 2.0,
+        "price": 10.0,
+        "total": 20.0,
+        "cash_after": 80.0,
+    }
+    hand_edited = {**canonical, "side": " sell ", "ticker": "msft", "quantity": 1}
+    tx_path = tmp_path / "transactions.jsonl"
+    tx_path.write_text(
+        "\n".join(json.dumps(r) for r in (canonical, hand_edited, {"side": "BUY"}))
+        + "\n",
+        encoding="utf-8",
+    )
+
+    count, _, _, recent = reporting_mod._scan_trade_history_uncached(tx_path, 5)
+
+    assert count == 2
+    assert recent == [
+        reporting_mod._to_trade_line(hand_edited),
+        reporting_mod._to_trade_line(canonical),
+    ]
+    assert (recent[0].side, recent[0].ticker, recent[0].quantity) == (
+        "SELL",
+        "MSFT",
+        1.0,
+    )
+
+
+def test_report_records_are_slotted(tmp_path: Path) -> None:
+    from src.reporting import TradeLine
+
+    line = TradeLine("2026-02-05T10:00:00Z", "BUY", "AAPL", 1.0, 10.0, 10.0, 90.0)
+    data = build_report_data(
+        portfolio=Portfolio(cash=0.0),
+        transactions_path=tmp_path / "none.jsonl",
+        price_provider=lambda _t: 0.0,
+        clock=_fixed_clock,
+    )
+
+    assert not hasattr(line, "__dict__")
+    assert not hasattr(data, "__dict__")
+
+
+def test_write_report_text_overwrites_and_reports_errors(tmp_path: Path) -> None:
+    from src.errors import FileError
+
+    long_text = "x" * 10_000 + "\n"
+    first = write_report_text(text=long_text, out_dir=tmp_path, clock=_fixed_clock)
+    second = write_report_text(
+        text="Range: a — b\n", out_dir=tmp_path, clock=_fixed_clock
+    )
+
+    assert first == second
+    assert second.read_text(encoding="utf-8") == "Range: a — b\n"
+
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("", encoding="utf-8")
+    with pytest.raises(FileError):
+        write_report_text(text="x\n", out_dir=blocker, clock=_fixed_clock)
@@ -1,5 +1,5 @@
 import csv
-from datetime import datetime, timezone
+from datetime import UTC, datetime, timezone
 
 from src.portfolio import Portfolio
 from src.snapshot_store import SnapshotStore
@@ -49,3 +49,79 @@ def test_two_trades_write_two_snapshots(tmp_path):
     assert rows[1]["event"] == "SELL"
     assert rows[1]["timestamp"] == t1.isoformat()
     assert float(rows[1]["total_value"]) == 1020.0
+
+
+def test_snapshot_rows_match_csv_module_output(tmp_path):
+    t0 = datetime(2026, 2, 4, 12, 0, 0, tzinfo=timezone.utc)
+    path = tmp_path / "snapshots.csv"
+    store = SnapshotStore(path=path, clock=lambda: t0)
+
+    for qty in (2, 0.1):
+        assert store.append_snapshot(
+            event="BUY",
+            ticker="AAPL",
+            quantity=qty,
+            price=100.5,
+            cash=799.0,
+            holdings_value=201.0,
+        )
+
+    fields = [
+        "timestamp",
+        "event",
+        "ticker",
+        "quantity",
+        "price",
+        "cash",
+        "holdings_value",
+        "total_value",
+    ]
+    expected = tmp_path / "expected.csv"
+    with expected.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for qty in (2, 0.1):
+            writer.writerow(
+                [t0.isoformat(), "BUY", "AAPL", qty, 100.5, 799.0, 201.0, 1000.0]
+            )
+
+    assert path.read_bytes() == expected.read_bytes()
+
+
+def test_snapshot_store_keeps_file_open_between_appends(tmp_path):
+    path = tmp_path / "nested" / "snapshots.csv"
+    store = SnapshotStore(path=path)
+    row = {"event": "BUY", "ticker": "AAPL", "quantity": 1, "price": 1.0, "cash": 0.0}
+
+    assert store.append_snapshot(**row, holdings_value=1.0)
+    fh = store._fh
+    assert store.append_snapshot(**row, holdings_value=2.0)
+    assert store._fh is fh
+
+    # Rows are visible without closing (line buffered)
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+
+    store.close()
+    assert fh.closed
+    assert store.append_snapshot(**row, holdings_value=3.0)
+    store.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4
+    assert lines[0].startswith("timestamp,")
+    assert sum(line.startswith("timestamp,") for line in lines) == 1
+
+
+def test_default_snapshot_timestamp_keeps_isoformat_offset(tmp_path):
+    path = tmp_path / "snapshots.csv"
+    store = SnapshotStore(path=path)
+    assert store.append_snapshot(
+        event="BUY", ticker="AAPL", quantity=1, price=1.0, cash=0.0, holdings_value=1.0
+    )
+    store.close()
+
+    with path.open(newline="", encoding="utf-8") as f:
+        ts = next(csv.DictReader(f))["timestamp"]
+    # Same format as datetime.now(timezone.utc).isoformat() (never "Z")
+    assert ts.endswith("+00:00")
+    assert datetime.fromisoformat(ts).tzinfo == UTC
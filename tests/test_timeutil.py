@@ -0,0 +1,20 @@
+from datetime import UTC, datetime, timedelta
+
+from src import timeutil
+
+
+def test_utc_timestamp_iso_z_matches_datetime_format():
+    ts = timeutil.utc_timestamp_iso_z()
+    assert ts.endswith("Z") and len(ts) == len("2026-01-01T00:00:00.000000Z")
+
+    parsed = datetime.fromisoformat(ts)
+    assert abs(datetime.now(UTC) - parsed) < timedelta(seconds=5)
+
+
+def test_utc_timestamp_iso_matches_isoformat_offset():
+    ts = timeutil.utc_timestamp_iso()
+    assert ts.endswith("+00:00")
+    assert len(ts) == len(datetime(2026, 1, 1, tzinfo=UTC).isoformat()) + 7
+
+    parsed = datetime.fromisoformat(ts)
+    assert abs(datetime.now(UTC) - parsed) < timedelta(seconds=5)
@@ -1,6 +1,7 @@
 import json
 import pytest
 
+from src import transaction_logger
 from src.transaction_manager import TransactionManager
 from src.portfolio import Portfolio
 
@@ -28,10 +29,14 @@ def tm(portfolio, price_map):
     return TransactionManager(portfolio=portfolio, price_provider=price_provider)
 
 
+def _read_jsonl(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
 @pytest.fixture
 def temp_transactions_file(tmp_path, monkeypatch):
     """Use a temporary file instead of the real one."""
-    fake_file = tmp_path / "transactions.json"
+    fake_file = tmp_path / "transactions.jsonl"
     monkeypatch.setattr("src.transaction_logger.TRANSACTIONS_FILE", fake_file)
     return fake_file
 
@@ -46,8 +51,7 @@ def test_buy_appends_to_transaction_history(
     assert portfolio.holdings["AAPL"] == pytest.approx(10.0)
 
     assert temp_transactions_file.exists()
-    with temp_transactions_file.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = _read_jsonl(temp_transactions_file)
 
     assert len(data) == 1
     assert data[0]["side"] == "BUY"
@@ -70,8 +74,7 @@ def test_sell_appends_to_transaction_history(
     assert portfolio.holdings["AAPL"] == pytest.approx(9.0)
 
     assert temp_transactions_file.exists()
-    with temp_transactions_file.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = _read_jsonl(temp_transactions_file)
 
     assert len(data) == 1
     assert data[0]["side"] == "SELL"
@@ -93,9 +96,72 @@ def test_sell_completely_removes_ticker(
     assert "TSLA" not in portfolio.holdings
     assert portfolio.cash == pytest.approx(11000.0)
 
-    with temp_transactions_file.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = _read_jsonl(temp_transactions_file)
 
     assert len(data) == 1
     assert data[0]["side"] == "SELL"
     assert data[0]["quantity"] == 5.0
+
+
+def test_history_is_appended_one_line_per_trade(tm, price_map, temp_transactions_file):
+    tm.buy("AAPL", 2.0)
+    tm.buy("TSLA", 1.0)
+
+    lines = temp_transactions_file.read_bytes().splitlines()
+    assert len(lines) == 2
+    assert [json.loads(line)["ticker"] for line in lines] == ["AAPL", "TSLA"]
+
+
+def test_iter_records_skips_corrupt_lines(tmp_path):
+    path = tmp_path / "transactions.jsonl"
+    path.write_text('{"ticker": "AAPL"}\n\n{"ticker": "TS\n{"ticker": "MSFT"}\n')
+
+    records = list(transaction_logger.iter_transaction_records(path))
+
+    assert [r["ticker"] for r in records] == ["AAPL", "MSFT"]
+
+
+def test_legacy_json_history_is_migrated_once(tmp_path):
+    legacy = tmp_path / "transactions.json"
+    legacy.write_text(json.dumps([{"ticker": "AAPL"}, {"ticker": "MSFT"}]))
+    target = tmp_path / "transactions.jsonl"
+
+    assert transaction_logger.migrate_legacy_transactions(target) == 2
+    assert transaction_logger.migrate_legacy_transactions(target) == 0
+
+    assert _read_jsonl(target) == [{"ticker": "AAPL"}, {"ticker": "MSFT"}]
+    assert not legacy.exists()
+    assert (tmp_path / "transactions.json.migrated").exists()
+
+
+def test_failed_legacy_migration_is_logged_not_raised(tmp_path, monkeypatch):
+    legacy = tmp_path / "transactions.json"
+    legacy.write_text(json.dumps([{"ticker": "AAPL"}]))
+    target = tmp_path / "transactions.jsonl"
+
+    def deny(*_args):
+        raise PermissionError("read-only data dir")
+
+    with monkeypatch.context() as m:
+        m.setattr(transaction_logger.os, "replace", deny)
+        assert transaction_logger.migrate_legacy_transactions(target) == 0
+
+    assert legacy.exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["transactions.json"]
+    # Retried once the data dir is writable again
+    assert transaction_logger.migrate_legacy_transactions(target) == 1
+
+
+def test_read_records_parses_clean_and_damaged_history(tmp_path):
+    path = tmp_path / "transactions.jsonl"
+    path.write_text('{"ticker": "AAPL"}\r\n{"ticker": "MSFT"}\n')
+    assert transaction_logger.read_transaction_records(path) == [
+        {"ticker": "AAPL"},
+        {"ticker": "MSFT"},
+    ]
+
+    path.write_text('{"ticker": "AAPL"}\n\n{"ticker": "MS\n{"ticker": "NVDA"}\n')
+    assert [r["ticker"] for r in transaction_logger.read_transaction_records(path)] == [
+        "AAPL",
+        "NVDA",
+    ]
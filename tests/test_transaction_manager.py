@@ -8,7 +8,8 @@ from src.errors import ValidationError
 from src.logger import get_logger
 from src.portfolio import Portfolio
 from src.snapshot_store import SnapshotStore
-from src.transaction_logger import log_transaction, utc_timestamp_iso_z
+from src.timeutil import utc_timestamp_iso_z
+from src.transaction_logger import log_transaction
 from src.validators import validate_positive_number, validate_ticker
 from src.models.transaction import Transaction
 